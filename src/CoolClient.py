@@ -0,0 +1,40 @@
+"""
+Thin client of the compile server (`python -m cool.server`), with the output
+and exit status of CoolCompiler.py. If no server answers, it compiles the file
+itself. It only imports what it takes to ask, to start as fast as it can.
+
+    $ python CoolClient.py <file.cl> [socket]
+"""
+import json
+import os
+import socket
+import sys
+
+SOCKET = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'build', 'coolc.sock')
+
+def request(path, socket_path=SOCKET):
+    """
+    Response of the server at `socket_path` to compiling `path`, None if
+    there is no server to ask.
+    """
+    message = json.dumps({ 'path': path, 'cwd': os.getcwd() }).encode() + b'\n'
+    with socket.socket(socket.AF_UNIX) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return None
+        client.sendall(message)
+
+        response = client.makefile('rb').readline()
+    return json.loads(response) if response else None
+
+clfile = sys.argv[1]
+
+response = request(clfile, *sys.argv[2:3])
+if response is None:
+    from cool.server import compile_request
+    response = compile_request({ 'path': clfile })
+
+sys.stdout.write(response['stdout'])
+sys.stderr.write(response['stderr'])
+exit(response['status'])
@@ -0,0 +1,54 @@
+"""
+Lexing throughput of CoolLexer on comment heavy, string heavy and plain sources.
+
+    $ cd src
+    $ python -m benchmarks.lexer [repeat]
+"""
+import sys
+import time
+from cool.lexer import CoolLexer
+
+CLASS = '''
+class Point inherits IO {
+    x : Int <- 0;
+    y : Int <- 0;
+    move(dx : Int, dy : Int) : Point { { x <- x + dx; y <- y + dy; self; } };
+};
+'''
+
+def block_comments(size):
+    """
+    Classes under long `(* ... *)` comments, some nested, as in heavily
+    documented sources or commented out code.
+    """
+    doc = '(*\n' + ' * Moves the point by (dx, dy) and returns it, see *Point*.\n' * 40 + ' (* nested *)\n*)\n'
+    return (doc + CLASS) * (size // len(doc + CLASS) + 1)
+
+def line_comments(size):
+    doc = '-- Moves the point by (dx, dy) and returns it, see *Point*.\n' * 40
+    return (doc + CLASS) * (size // len(doc + CLASS) + 1)
+
+def strings(size):
+    literal = 'class A { s : String <- "' + 'Moves the point by \\"(dx, dy)\\".\\n' * 5 + '"; };\n'
+    return literal * (size // len(literal) + 1)
+
+def no_comments(size):
+    return CLASS * (size // len(CLASS) + 1)
+
+def measure(code, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        errors, tokens = CoolLexer().tokenize(code)
+        best = min(best, time.perf_counter() - start)
+    assert not errors
+    return best, len(tokens)
+
+def main(repeat=3, size=1 << 20):
+    for source in (block_comments, line_comments, strings, no_comments):
+        code = source(size)
+        elapsed, tokens = measure(code, repeat)
+        print('%-15s %7d tokens %8.1f ms %7.2f MB/s' % (source.__name__, tokens, elapsed * 1000, len(code) / elapsed / 1e6))
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
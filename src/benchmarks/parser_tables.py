@@ -0,0 +1,179 @@
+"""
+Construction time of the parsing tables of CoolGrammar.
+
+    $ cd src
+    $ python -m benchmarks.parser_tables [repeat]
+"""
+import os
+import sys
+import time
+from cool.parser import CoolGrammar
+from cool.cmp import ContainerSet, GrammarTools, Item, State, LR1Parser, LALR1Parser
+
+def expand(item, firsts):
+    next_symbol = item.NextSymbol
+    if next_symbol is None or not next_symbol.IsNonTerminal:
+        return []
+
+    lookaheads = ContainerSet()
+    # (Compute lookahead for child items)
+    for preview in item.Preview():
+        lookaheads.hard_update(GrammarTools.compute_local_first(firsts, preview))
+
+    assert not lookaheads.contains_epsilon
+    # (Build and return child items)
+    return [Item(prod, 0, lookaheads) for prod in next_symbol.productions]
+
+def compress(items):
+    centers = {}
+
+    for item in items:
+        center = item.Center()
+        try:
+            lookaheads = centers[center]
+        except KeyError:
+            centers[center] = lookaheads = set()
+        lookaheads.update(item.lookaheads)
+
+    return { Item(x.production, x.pos, set(lookahead)) for x, lookahead in centers.items() }
+
+class ItemLR1Parser(LR1Parser):
+    """
+    LR1Parser with the former automaton builder, over `Item` objects
+    instead of the integer coded items of `LRItems`.
+    """
+    @staticmethod
+    def closure_lr1(items, firsts, suffix_firsts=None):
+        """
+        Worklist closure: every (center, lookahead) pair is expanded once.
+        `suffix_firsts` memoizes First(beta) for each item A -> alpha . B beta
+        and may be shared between calls.
+        """
+        if suffix_firsts is None:
+            suffix_firsts = {}
+
+        centers = {}
+        pending = []
+
+        def push(center, lookaheads):
+            try:
+                current = centers[center]
+            except KeyError:
+                current = centers[center] = set()
+            for lookahead in lookaheads:
+                if lookahead not in current:
+                    current.add(lookahead)
+                    pending.append((center, lookahead))
+
+        for item in items:
+            push((item.production, item.pos), item.lookaheads)
+
+        expanded = set()
+        while pending:
+            center, lookahead = pending.pop()
+            production, pos = center
+
+            next_symbol = production.Right[pos] if pos < len(production.Right) else None
+            if next_symbol is None or not next_symbol.IsNonTerminal:
+                continue
+
+            try:
+                first, nullable = suffix_firsts[center]
+            except KeyError:
+                local_first = GrammarTools.compute_local_first(firsts, production.Right[pos + 1:])
+                first, nullable = suffix_firsts[center] = (frozenset(local_first), local_first.contains_epsilon)
+
+            # First(beta) reaches the children regardless of the lookahead
+            if center not in expanded:
+                expanded.add(center)
+                for prod in next_symbol.productions:
+                    push((prod, 0), first)
+
+            if nullable:
+                for prod in next_symbol.productions:
+                    push((prod, 0), (lookahead,))
+
+        return { Item(production, pos, lookaheads) for (production, pos), lookaheads in centers.items() }
+
+    def build_LR1_automaton(self):
+        G = self.augmentedG = self.G.AugmentedGrammar(True)
+
+        firsts = GrammarTools.compute_firsts(G)
+        firsts[G.EOF] = ContainerSet(G.EOF)
+        suffix_firsts = {}
+
+        start = frozenset([ Item(G.startSymbol.productions[0], 0, lookaheads=(G.EOF,)) ])
+        automaton = State(frozenset(self.closure_lr1(start, firsts, suffix_firsts)), True)
+
+        pending = [ start ]
+        visited = { start: automaton }
+        symbols = G.terminals + G.nonTerminals
+
+        while pending:
+            current_state = visited[pending.pop()]
+
+            gotos = {}
+            for item in current_state.state:
+                next_symbol = item.NextSymbol
+                if next_symbol is not None:
+                    gotos.setdefault(next_symbol, []).append(item.NextItem())
+
+            for symbol in symbols:
+                try:
+                    kernels = frozenset(gotos[symbol])
+                except KeyError:
+                    continue
+
+                try:
+                    next_state = visited[kernels]
+                except KeyError:
+                    pending.append(kernels)
+                    visited[kernels] = next_state = State(frozenset(self.closure_lr1(kernels, firsts, suffix_firsts)), True)
+
+                current_state.add_transition(symbol.Name, next_state)
+
+        self.automaton = automaton
+
+class FixpointLR1Parser(ItemLR1Parser):
+    """
+    LR1Parser with the former closure: expands every item
+    of the closure again until nothing changes.
+    """
+    @staticmethod
+    def closure_lr1(items, firsts, suffix_firsts=None):
+        closure = ContainerSet(*items)
+
+        changed = True
+        while changed:
+            new_items = ContainerSet()
+            for item in closure:
+                new_items.extend(expand(item, firsts))
+
+            changed = closure.update(new_items)
+
+        return compress(closure)
+
+class ParallelLR1Parser(LR1Parser):
+    """
+    LR1Parser closing the frontiers of the automaton in a process per core.
+    """
+    def __init__(self, G):
+        super().__init__(G, workers=os.cpu_count())
+
+def measure(parser_class, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser = parser_class(CoolGrammar)
+        best = min(best, time.perf_counter() - start)
+    return best, len(parser.action)
+
+def main(repeat=3):
+    baseline = None
+    for parser_class in (FixpointLR1Parser, ItemLR1Parser, LR1Parser, ParallelLR1Parser, LALR1Parser):
+        elapsed, states = measure(parser_class, repeat)
+        baseline = baseline or elapsed
+        print('%-18s %5d states %9.1f ms %6.1fx' % (parser_class.__name__, states, elapsed * 1000, baseline / elapsed))
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
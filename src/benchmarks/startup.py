@@ -0,0 +1,57 @@
+"""
+Cold start time of CoolCompiler.py, over a bare interpreter, and the
+imports that take the most of it (from `-X importtime`).
+
+    $ cd src
+    $ python -m benchmarks.startup [repeat] [file.cl ...]
+"""
+import re
+import subprocess
+import sys
+import time
+
+# a program that compiles, one with a lexical error and one with a syntax error
+FILES = ('../tests/codegen/arith.cl', '../tests/lexer/iis1.cl', '../tests/parser/assignment1.cl')
+
+# `import time: self [us] | cumulative | imported package`
+IMPORT_TIME = re.compile(r'import time:\s*(\d+) \|\s*(\d+) \| (\s*)(\S+)')
+
+def run(command, repeat):
+    best, log = float('inf'), ''
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, '-X', 'importtime'] + command, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if elapsed < best:
+            best, log = elapsed, process.stderr
+    return best, import_times(log)
+
+def import_times(log):
+    """
+    `{module: (self, cumulative, depth)}` in microseconds of an `-X importtime` log.
+    """
+    times = {}
+    for line in log.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            times[module] = (int(own), int(cumulative), len(indent) // 2)
+    return times
+
+def main(repeat=5, *files):
+    interpreter, base_imports = run(['-c', 'pass'], repeat)
+    print('%-32s %8.1f ms' % ('python -c pass', interpreter * 1000))
+
+    for path in files or FILES:
+        elapsed, times = run(['CoolCompiler.py', path], repeat)
+        imports = sum(cumulative for module, (_, cumulative, depth) in times.items() if depth == 0 and module not in base_imports)
+        cool = sum(cumulative for module, (_, cumulative, depth) in times.items() if module.split('.')[0] == 'cool' and depth == 0)
+        print('%-32s %8.1f ms %+8.1f ms  imports %6.1f ms (cool %6.1f ms)' % (
+            path, elapsed * 1000, (elapsed - interpreter) * 1000, imports / 1000, cool / 1000))
+
+        slowest = sorted((own, module) for module, (own, _, _) in times.items() if module not in base_imports)[-5:]
+        for own, module in reversed(slowest):
+            print('    %-28s %8.1f ms' % (module, own / 1000))
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]), *sys.argv[2:])
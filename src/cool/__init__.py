@@ -1,8 +1,38 @@
 from .errors import *
-from .comment import *
-from .lexer import *
-from .parser import *
-from .format_visitor import FormatVisitor
-from .type_collector import TypeCollector
-from .type_builder import TypeBuilder
-from .type_checker import TypeChecker
\ No newline at end of file
+from .nodes import *
+from .cmp import lazy_getattr, once
+
+# the other modules are imported on the first use of one of their names, so
+# a tool pays for the phases it goes through
+EXPORTS = {
+    'comment': ('remove_comments',),
+    'source': ('SourceMap',),
+    'lexer': ('CoolLexer', 'tokenizer'),
+    'format_visitor': ('FormatVisitor',),
+    'type_collector': ('TypeCollector',),
+    'type_builder': ('TypeBuilder',),
+    'type_checker': ('TypeChecker',),
+    # the grammar and its parser are only built when asked for
+    'parser': ('CoolGrammar', 'CoolParser'),
+    'compiler': ('Compilation', 'compile_source', 'compile_file', 'compile_text'),
+}
+
+__getattr__ = lazy_getattr(__name__, EXPORTS)
+
+@once
+def load_parser():
+    """
+    `parse(tokens)` of the generated `cool/parsetab.py` when it is up to
+    date with the grammar, else the one of `cool.parser`, which builds
+    (or loads from the cache) the parsing tables. It is only looked up on
+    the first call.
+    """
+    try:
+        from . import parsetab
+        if parsetab.up_to_date():
+            return parsetab.parse
+    except ImportError:
+        pass
+
+    from .parser import parse
+    return parse
@@ -0,0 +1,81 @@
+"""
+Compiles many COOL files in one run, on a pool of processes, and writes a JSON
+line per file, in the order of the input, as soon as it and those before it
+are done:
+
+    {"path": ..., "status": 0 or 1, "errors": [{"line": ..., "column": ..., "type": ..., "message": ...}]}
+
+The errors and the status are those of CoolCompiler.py on the file. The exit
+status is 1 if any file has errors.
+
+    $ cd src
+    $ python -m cool.batch [--jobs N] <file.cl or directory> ...
+"""
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from .compiler import compile_file, warm_up
+from .errors import CompilerError
+
+def cool_files(paths):
+    """
+    `paths` with the directories replaced by the `.cl` files under them, sorted.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith('.cl'):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+def compile_result(path):
+    """
+    JSON serializable result of compiling `path`, see the module docstring.
+    A file that cannot be compiled, e.g. one that is not UTF-8, gets a
+    CompilerError instead of stopping the batch.
+    """
+    try:
+        errors, status = compile_file(path)
+    except Exception as ex:
+        errors, status = [ CompilerError((0, 0), 'El archivo ' + path + ' no se pudo compilar: ' + repr(ex)) ], 1
+    return {
+        'path': path,
+        'status': status,
+        'errors': [ { 'line': error.pos[0], 'column': error.pos[1], 'type': error.name, 'message': error.body } for error in errors ],
+    }
+
+def compile_all(paths, jobs=None, chunksize=4):
+    """
+    Results of compiling `paths`, in order, on `jobs` processes (one per CPU
+    by default), each one warmed up once. With a single job the files are
+    compiled in this process.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        yield from map(compile_result, paths)
+        return
+
+    with ProcessPoolExecutor(jobs, initializer=warm_up) as executor:
+        yield from executor.map(compile_result, paths, chunksize=chunksize)
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='python -m cool.batch', description='Compiles many COOL files')
+    parser.add_argument('paths', nargs='+', help='.cl files or directories')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes, one per CPU by default')
+    args = parser.parse_args(argv)
+
+    status = 0
+    for result in compile_all(cool_files(args.paths), args.jobs):
+        sys.stdout.write(json.dumps(result) + '\n')
+        sys.stdout.flush()
+        status |= result['status']
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
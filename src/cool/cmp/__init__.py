@@ -1,7 +1,19 @@
-from .automata import *
-from .evaluation import *
-from .grammartools import *
-from .grammar import *
-from .semantic import *
-from .utils import *
-from .visitor import *
\ No newline at end of file
+from .utils import lazy_getattr
+
+# the modules are imported on the first use of one of their names
+EXPORTS = {
+    'automata': ('State',),
+    'evaluation': ('evaluate_reverse_parse',),
+    'grammartools': ('GrammarTools', 'GrammarAnalysis', 'Action', 'ParsingTable', 'lr_parse', 'ShiftReduceParser',
+                     'LRItems', 'closure_lr1', 'LR1Parser', 'LALR1Parser'),
+    'grammar': ('Symbol', 'NonTerminal', 'Terminal', 'EOF', 'Sentence', 'SentenceList', 'Epsilon', 'Production',
+                'AttributeProduction', 'Grammar', 'Item'),
+    'lexer': ('Lexer',),
+    'regex': ('regex_automaton',),
+    'semantic': ('SemanticErrorException', 'Attribute', 'Method', 'Type', 'ErrorType', 'Context', 'VariableInfo', 'Scope'),
+    'utils': ('ContainerSet', 'Token', 'append', 'once', 'lazy_getattr'),
+    'visitor': ('on', 'when'),
+}
+
+__all__ = [ name for names in EXPORTS.values() for name in names ]
+__getattr__ = lazy_getattr(__name__, EXPORTS)
\ No newline at end of file
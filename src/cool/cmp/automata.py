@@ -1,3 +1,6 @@
+from array import array
+from itertools import chain
+
 class State:
     def __init__(self, state, final=False, formatter=lambda x: str(x)):
         self.state = state
@@ -13,13 +16,8 @@ class State:
         elif self in visited:
             return
 
-        visited.add(self)
-        self.formatter = formatter
-        for destinations in self.transitions.values():
-            for node in destinations:
-                node.set_formatter(formatter, visited)
-        for node in self.epsilon_transitions:
-            node.set_formatter(formatter, visited)
+        for node in self._visit(visited):
+            node.formatter = formatter
         return self
 
     def has_transition(self, symbol):
@@ -44,34 +42,161 @@ class State:
         return any(s.final for s in states)
 
     def to_deterministic(self, formatter=lambda x: str(x)):
-        closure = self.epsilon_closure
+        """
+        Subset construction of the DFA of this NFA, the DFA states are keyed
+        by their closures and the closure of every NFA state is found once.
+        """
+        closures = {}
+
+        def closure_of(states):
+            closure = set()
+            for state in states:
+                try:
+                    closure.update(closures[state])
+                except KeyError:
+                    closures[state] = state_closure = frozenset(State.epsilon_closure_by_state(state))
+                    closure.update(state_closure)
+            return frozenset(closure)
+
+        closure = closure_of([ self ])
         start = State(tuple(closure), any(s.final for s in closure), formatter)
 
-        closures = [ closure ]
-        states = [ start ]
-        pending = [ start ]
+        states = { closure: start }
+        pending = [ closure ]
 
         while pending:
-            state = pending.pop()
-            symbols = { symbol for s in state.state for symbol in s.transitions }
-
-            for symbol in symbols:
-                move = self.move_by_state(symbol, *state.state)
-                closure = self.epsilon_closure_by_state(*move)
-
-                if closure not in closures:
-                    new_state = State(tuple(closure), any(s.final for s in closure), formatter)
-                    closures.append(closure)
-                    states.append(new_state)
-                    pending.append(new_state)
-                else:
-                    index = closures.index(closure)
-                    new_state = states[index]
+            closure = pending.pop()
+            state = states[closure]
+
+            moves = {}
+            for s in closure:
+                for symbol, destinations in s.transitions.items():
+                    moves.setdefault(symbol, set()).update(destinations)
+
+            for symbol, move in moves.items():
+                closure = closure_of(move)
+
+                try:
+                    new_state = states[closure]
+                except KeyError:
+                    states[closure] = new_state = State(tuple(closure), any(s.final for s in closure), formatter)
+                    pending.append(closure)
 
                 state.add_transition(symbol, new_state)
 
         return start
 
+    def to_arrays(self):
+        """
+        `(states, symbols, transitions)` of the DFA from this state: its
+        states in visiting order (this one first), its symbols and an
+        `array('i')` where the entry of the state `i` on the symbol `j`,
+        at `i * len(symbols) + j`, is the index of its target or -1.
+        """
+        states = list(self)
+        ids = { state: i for i, state in enumerate(states) }
+        symbols = sorted({ symbol for state in states for symbol in state.transitions }, key=str)
+        columns = { symbol: j for j, symbol in enumerate(symbols) }
+
+        transitions = array('i', [-1]) * (len(states) * len(symbols))
+        for i, state in enumerate(states):
+            for symbol, (target,) in state.transitions.items():
+                transitions[i * len(symbols) + columns[symbol]] = ids[target]
+
+        return states, symbols, transitions
+
+    def minimize(self, key=lambda state: state.final, formatter=lambda x: str(x)):
+        """
+        Hopcroft's minimal DFA of the DFA from this state, with the states
+        of the same `key` (finality by default) as the first partition. The
+        states of the minimal DFA are the tuples of the states they merge,
+        and those that reach no final state are left out.
+        """
+        states, symbols, transitions = self.to_arrays()
+        width = len(symbols)
+        dead = len(states)
+
+        # the DFA made complete with a dead state, and its transitions backwards
+        sources = [ [ [] for _ in range(dead + 1) ] for _ in symbols ]
+        for i in range(dead):
+            for j in range(width):
+                target = transitions[i * width + j]
+                sources[j][dead if target < 0 else target].append(i)
+        for j in range(width):
+            sources[j][dead].append(dead)
+
+        # the states that reach no final one go with the dead state from the start
+        live = { i for i, state in enumerate(states) if state.final }
+        pending = list(live)
+        while pending:
+            target = pending.pop()
+            for j in range(width):
+                for i in sources[j][target]:
+                    if i not in live:
+                        live.add(i)
+                        pending.append(i)
+
+        blocks = {}
+        for i, state in enumerate(states):
+            if i in live:
+                blocks.setdefault(key(state), set()).add(i)
+        partition = list(blocks.values()) + [ set(range(dead + 1)) - live ]
+        dead_block = len(partition) - 1
+        block_of = [0] * (dead + 1)
+        for b, block in enumerate(partition):
+            for i in block:
+                block_of[i] = b
+
+        pending = set(range(len(partition)))
+        while pending:
+            # a copy, the block may be split while it refines the others
+            splitter = set(partition[pending.pop()])
+            for j in range(width):
+                predecessors = { i for target in splitter for i in sources[j][target] }
+
+                touched = {}
+                for i in predecessors:
+                    touched.setdefault(block_of[i], set()).add(i)
+
+                for b, inside in touched.items():
+                    block = partition[b]
+                    if len(inside) == len(block):
+                        continue
+
+                    block -= inside
+                    partition.append(inside)
+                    new = len(partition) - 1
+                    for i in inside:
+                        block_of[i] = new
+
+                    if b in pending or len(inside) <= len(block):
+                        pending.add(new)
+                    else:
+                        pending.add(b)
+
+        # the blocks in the order of their first states, the block of the dead
+        # state never splits and is left out, but for this state if it is there
+        order = { block_of[0]: 0 }
+        for i in range(dead):
+            if block_of[i] != dead_block:
+                order.setdefault(block_of[i], len(order))
+
+        merged = [ None ] * len(order)
+        for b, new in order.items():
+            members = tuple(states[i] for i in sorted(partition[b]) if i < dead)
+            merged[new] = State(members, any(s.final for s in members), formatter)
+
+        for b, new in order.items():
+            if b == dead_block:
+                continue
+            i = min(partition[b])
+            for j, symbol in enumerate(symbols):
+                target = transitions[i * width + j]
+                if target >= 0 and block_of[target] != dead_block:
+                    merged[new].add_transition(symbol, merged[order[block_of[target]]])
+
+        return merged[0]
+
     @staticmethod
     def from_nfa(nfa, get_states=False):
         states = []
@@ -93,15 +218,14 @@ class State:
 
     @staticmethod
     def epsilon_closure_by_state(*states):
-        closure = { state for state in states }
-
-        l = 0
-        while l != len(closure):
-            l = len(closure)
-            tmp = [s for s in closure]
-            for s in tmp:
-                for epsilon_state in s.epsilon_transitions:
-                        closure.add(epsilon_state)
+        closure = set(states)
+        pending = list(closure)
+
+        while pending:
+            for epsilon_state in pending.pop().epsilon_transitions:
+                if epsilon_state not in closure:
+                    closure.add(epsilon_state)
+                    pending.append(epsilon_state)
         return closure
 
     @property
@@ -144,16 +268,19 @@ class State:
         yield from self._visit()
 
     def _visit(self, visited=None):
+        # depth first, with a stack of the destinations left of every node on the path
         if visited is None:
             visited = set()
         elif self in visited:
             return
 
-        visited.add(self)
-        yield self
-
-        for destinations in self.transitions.values():
-            for node in destinations:
-                yield from node._visit(visited)
-        for node in self.epsilon_transitions:
-            yield from node._visit(visited)
\ No newline at end of file
+        stack = [ iter([ self ]) ]
+        while stack:
+            for node in stack[-1]:
+                if node not in visited:
+                    visited.add(node)
+                    yield node
+                    stack.append(chain(chain.from_iterable(node.transitions.values()), node.epsilon_transitions))
+                    break
+            else:
+                stack.pop()
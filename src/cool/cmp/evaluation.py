@@ -30,5 +30,6 @@ def evaluate_reverse_parse(right_parse, operations, tokens):
             raise Exception('Invalid action!!!')
 
     assert len(stack) == 1
-    assert isinstance(next(tokens).token_type, EOF)
+    eof = next(tokens).token_type
+    assert isinstance(eof, EOF) or eof == '$'
     return stack[0]
\ No newline at end of file
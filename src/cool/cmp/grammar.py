@@ -464,7 +464,7 @@ class Item:
     def __init__(self, production, pos, lookaheads=[]):
         self.production = production
         self.pos = pos
-        self.lookaheads = frozenset(look for look in lookaheads)
+        self.lookaheads = lookaheads if isinstance(lookaheads, frozenset) else frozenset(lookaheads)
 
     def __str__(self):
         s = str(self.production.Left) + " -> "
@@ -488,7 +488,7 @@ class Item:
         return (
             (self.pos == other.pos) and
             (self.production == other.production) and
-            (set(self.lookaheads) == set(other.lookaheads))
+            (self.lookaheads == other.lookaheads)
         )
 
     def __hash__(self):
@@ -1,3 +1,7 @@
+import os
+import json
+import hashlib
+from array import array
 from queue import Queue
 from .grammar import Grammar, Item
 from .automata import State
@@ -42,85 +46,27 @@ class GrammarTools:
         Computes First(Vt) U First(Vn) U First(alpha)
         P: X -> alpha
         """
+        analysis = GrammarAnalysis(G)
         firsts = {}
-        change = True
-        
-        # init First(Vt)
+
         for terminal in G.terminals:
             firsts[terminal] = ContainerSet(terminal)
-            
-        # init First(Vn)
+
         for nonterminal in G.nonTerminals:
-            firsts[nonterminal] = ContainerSet()
-        
-        while change:
-            change = False
-            
-            # P: X -> alpha
-            for production in G.Productions:
-                X = production.Left
-                alpha = production.Right
-                
-                # get current First(X)
-                first_X = firsts[X]
-                    
-                # init First(alpha)
-                try:
-                    first_alpha = firsts[alpha]
-                except:
-                    first_alpha = firsts[alpha] = ContainerSet()
-                
-                # CurrentFirst(alpha)???
-                local_first = GrammarTools.compute_local_first(firsts, alpha)
-                
-                # update First(X) and First(alpha) from CurrentFirst(alpha)
-                change |= first_alpha.hard_update(local_first)
-                change |= first_X.hard_update(local_first)
-                        
-        # First(Vt) + First(Vt) + First(RightSides)
+            firsts[nonterminal] = analysis.first_set(*analysis.first_of((nonterminal,)))
+
+        for production in G.Productions:
+            firsts[production.Right] = analysis.first_set(*analysis.first_of(production.Right))
+
         return firsts
 
     @staticmethod
-    def compute_follows(G: Grammar, firsts):
+    def compute_follows(G: Grammar, firsts=None):
         """
         Computes Follow(Vn)
         """
-        follows = { }
-        change = True
-        
-        local_firsts = {}
-        
-        # init Follow(Vn)
-        for nonterminal in G.nonTerminals:
-            follows[nonterminal] = ContainerSet()
-        follows[G.startSymbol] = ContainerSet(G.EOF)
-        
-        while change:
-            change = False
-            
-            # P: X -> alpha
-            for production in G.Productions:
-                X = production.Left
-                alpha = production.Right
-                
-                follow_X = follows[X]
-                
-                # X -> zeta Y beta
-                # First(beta) - { epsilon } subset of Follow(Y)
-                # beta ->* epsilon or X -> zeta Y ? Follow(X) subset of Follow(Y)
-                for i, symbol in enumerate(alpha):
-                    if symbol.IsNonTerminal:
-                        follow_symbol = follows[symbol]
-                        beta = alpha[i + 1:]
-                        try:
-                            first_beta = local_firsts[beta]
-                        except KeyError:
-                            first_beta = local_firsts[beta] = GrammarTools.compute_local_first(firsts, beta)
-                        change |= follow_symbol.update(first_beta)
-                        if first_beta.contains_epsilon or len(beta) == 0:
-                            change |= follow_symbol.update(follow_X)
-        
-        return follows
+        analysis = GrammarAnalysis(G)
+        return { X: ContainerSet(*analysis.terminals_of(analysis.follow[analysis.symbol_ids[X]])) for X in G.nonTerminals }
 
     @staticmethod
     def _register(table, state, symbol, value):
@@ -139,6 +85,203 @@ class GrammarTools:
 
         return len(cell) == 1
 
+    @staticmethod
+    def digraph(nodes, relation, initial, copy=set):
+        """
+        Computes F(x) = initial[x] U { F(y) | x R y } for every node
+        (DeRemer & Pennello), solving each strongly connected
+        component of R just once. The values are sets, or ints
+        holding bitsets with `copy=int`.
+        """
+        infinity = len(nodes) + 1
+        depth = { x: 0 for x in nodes }
+        result = {}
+        stack = []
+
+        def visit(x):
+            stack.append(x)
+            depth[x] = len(stack)
+            result[x] = copy(initial[x]) if x in initial else copy()
+            return x, depth[x], iter(relation.get(x, ()))
+
+        for root in nodes:
+            if depth[root]:
+                continue
+
+            pending = [ visit(root) ]
+            while pending:
+                x, d, successors = pending[-1]
+                for y in successors:
+                    if not depth[y]:
+                        pending.append(visit(y))
+                        break
+                    depth[x] = min(depth[x], depth[y])
+                    result[x] |= result[y]
+                else:
+                    pending.pop()
+                    # x is the root of a component: every member gets its result
+                    if depth[x] == d:
+                        while True:
+                            top = stack.pop()
+                            depth[top] = infinity
+                            result[top] = result[x]
+                            if top == x:
+                                break
+                    if pending:
+                        parent = pending[-1][0]
+                        depth[parent] = min(depth[parent], depth[x])
+                        result[parent] |= result[x]
+
+        return result
+
+    @staticmethod
+    def rule_identity(rule):
+        """
+        Stable fingerprint of a semantic rule, independent of
+        the process it was created in.
+        """
+        if rule is None:
+            return b'-'
+
+        try:
+            return GrammarTools._code_identity(rule.__code__)
+        except AttributeError:
+            return repr(rule).encode()
+
+    @staticmethod
+    def is_identity(production):
+        """
+        Checks that `production` is A -> X with the rule `lambda h, s: s[1]`,
+        so reducing it leaves the value as is.
+        """
+        rule = getattr(production, 'attributes', (None,))[0]
+        if len(production.Right) != 1 or rule is None:
+            return False
+        return GrammarTools.rule_identity(rule) == GrammarTools.rule_identity(lambda h, s: s[1])
+
+    @staticmethod
+    def _code_identity(code):
+        identity = [code.co_code, repr(code.co_names).encode()]
+        for const in code.co_consts:
+            if hasattr(const, 'co_code'):
+                identity.append(GrammarTools._code_identity(const))
+            else:
+                identity.append(repr(const).encode())
+        return b':'.join(identity)
+
+class GrammarAnalysis:
+    """
+    Nullable non-terminals, First and Follow of a grammar as int bitsets.
+
+    Symbols are numbered terminals first (EOF last), then non-terminals, and
+    the bit `t` of a set stands for the terminal `t`. Both First and Follow
+    are solved with `GrammarTools.digraph`, one strongly connected component
+    of the dependency graph at a time.
+    """
+    def __init__(self, G):
+        self.terminals = G.terminals + [ G.EOF ]
+        self.symbols = self.terminals + G.nonTerminals
+        self.symbol_ids = ids = { X: i for i, X in enumerate(self.symbols) }
+        self.nonterminal_start = len(self.terminals)
+        self._terminals = {}
+        productions = [ (ids[p.Left], [ ids[X] for X in p.Right ]) for p in G.Productions ]
+        nonterminals = range(self.nonterminal_start, len(self.symbols))
+
+        self.nullable = nullable = self._nullables(productions)
+
+        # X -> alpha Y beta, alpha ->* epsilon: First(Y) subset of First(X)
+        direct_first, first_relation = {}, {}
+        for X, right in productions:
+            for Y in right:
+                if Y < self.nonterminal_start:
+                    direct_first[X] = direct_first.get(X, 0) | 1 << Y
+                    break
+                first_relation.setdefault(X, []).append(Y)
+                if Y not in nullable:
+                    break
+
+        first = GrammarTools.digraph(nonterminals, first_relation, direct_first, copy=int)
+        self.first = [ 1 << t for t in range(self.nonterminal_start) ] + [ first[X] for X in nonterminals ]
+
+        # X -> alpha Y beta: First(beta) subset of Follow(Y)
+        # beta ->* epsilon: Follow(X) subset of Follow(Y)
+        direct_follow, follow_relation = { ids[G.startSymbol]: 1 << ids[G.EOF] }, {}
+        for X, right in productions:
+            suffix, suffix_nullable = 0, True
+            for Y in reversed(right):
+                if Y >= self.nonterminal_start:
+                    direct_follow[Y] = direct_follow.get(Y, 0) | suffix
+                    if suffix_nullable:
+                        follow_relation.setdefault(Y, []).append(X)
+                suffix, suffix_nullable = self.prepend(Y, suffix, suffix_nullable)
+
+        follow = GrammarTools.digraph(nonterminals, follow_relation, direct_follow, copy=int)
+        self.follow = [ 0 ] * self.nonterminal_start + [ follow[X] for X in nonterminals ]
+
+    def _nullables(self, productions):
+        # symbols of a right side not known to be nullable yet, -1 if it has terminals
+        remaining, occurrences = [], {}
+        pending = []
+        for i, (X, right) in enumerate(productions):
+            if any(Y < self.nonterminal_start for Y in right):
+                remaining.append(-1)
+                continue
+            remaining.append(len(right))
+            for Y in right:
+                occurrences.setdefault(Y, []).append(i)
+            if not right:
+                pending.append(X)
+
+        nullable = set()
+        while pending:
+            X = pending.pop()
+            if X in nullable:
+                continue
+            nullable.add(X)
+            for i in occurrences.get(X, ()):
+                remaining[i] -= 1
+                if not remaining[i]:
+                    pending.append(productions[i][0])
+
+        return nullable
+
+    def prepend(self, X, first, nullable):
+        """
+        First(X beta) and whether X beta ->* epsilon, given the symbol id `X`
+        and the same for beta.
+        """
+        if X < self.nonterminal_start:
+            return 1 << X, False
+        if X in self.nullable:
+            return self.first[X] | first, nullable
+        return self.first[X], False
+
+    def first_of(self, alpha):
+        """
+        First(alpha) as a bitset, and whether alpha ->* epsilon.
+        """
+        first, nullable = 0, True
+        for X in reversed(list(alpha)):
+            first, nullable = self.prepend(self.symbol_ids[X], first, nullable)
+        return first, nullable
+
+    def terminals_of(self, bits):
+        try:
+            return self._terminals[bits]
+        except KeyError:
+            pass
+
+        terminals, rest = [], bits
+        while rest:
+            low = rest & -rest
+            terminals.append(self.terminals[low.bit_length() - 1])
+            rest ^= low
+        self._terminals[bits] = terminals
+        return terminals
+
+    def first_set(self, bits, nullable=False):
+        return ContainerSet(*self.terminals_of(bits), contains_epsilon=nullable)
+
 class Action(tuple):
     SHIFT = 'SHIFT'
     REDUCE = 'REDUCE'
@@ -153,172 +296,742 @@ class Action(tuple):
 
     __repr__ = __str__
 
+class ParsingTable:
+    """
+    Integer coded and compressed action/goto tables of a ShiftReduceParser.
+
+    Symbols and productions are numbered as they appear in the grammar (EOF
+    is the last terminal). An action entry is 0 on error, `s + 1` to shift
+    `s`, `-(p + 1)` to reduce by the production `p` and `-(accept + 1)` to
+    accept.
+
+    Tokens may carry either the terminal or its name as `token_type`.
+
+    A state with a single reduction takes it as its default, instead of
+    erring, so it needs no lookahead. The other entries are packed with row
+    displacement: the entry of `state` on `t` is at `action_base[state] + t`
+    in `action_entries` if `action_check` there is `state`, else it is
+    `defaults[state]`. Gotos are always defined when looked up, so they are
+    packed the same way without a check vector.
+
+    `chain_goto` is `goto` bypassing the states whose only action is reducing
+    an identity unit production (e.g. `term -> factor`), and `units` flags
+    those productions, so `lr_parse` goes through precedence chains without
+    running their rules.
+    """
+    def __init__(self, parser):
+        G = parser.G
+
+        self.terminals = G.terminals + [ G.EOF ]
+        self.nonterminals = G.nonTerminals
+        self.productions = G.Productions
+        self.accept = len(self.productions)
+        # the `error` terminal of the error productions, if any
+        self.error = next((i for i, t in enumerate(self.terminals) if t.Name == 'error'), -1)
+
+        self.terminal_ids = { t: i for i, t in enumerate(self.terminals) }
+        self.terminal_ids.update((t.Name, i) for i, t in enumerate(self.terminals))
+        self.nonterminal_ids = { X: i for i, X in enumerate(self.nonterminals) }
+        production_ids = { p: i for i, p in enumerate(self.productions) }
+
+        # (lhs id, rhs length) of every production and its synthesized attribute rule
+        self.lhs = array('i', (self.nonterminal_ids[p.Left] for p in self.productions))
+        self.rhs = array('i', (len(p.Right) for p in self.productions))
+        self.rules = tuple(getattr(p, 'attributes', (None,))[0] for p in self.productions)
+        self.units = array('b', (GrammarTools.is_identity(p) for p in self.productions))
+
+        self.states = 1 + max(max(parser.action, default=0), max(parser.goto, default=0))
+        self.width = len(self.terminals)
+        self.goto_width = len(self.nonterminals)
+
+        actions = [ {} for _ in range(self.states) ]
+        for state, row in parser.action.items():
+            for symbol, cell in row.items():
+                action, tag = cell[0]
+                if action == Action.SHIFT:
+                    entry = tag + 1
+                elif action == Action.REDUCE:
+                    entry = -(production_ids[tag] + 1)
+                else:
+                    entry = -(self.accept + 1)
+                actions[state][self.terminal_ids[symbol]] = entry
+
+        gotos = [ {} for _ in range(self.states) ]
+        for state, row in parser.goto.items():
+            for symbol, cell in row.items():
+                gotos[state][self.nonterminal_ids[symbol]] = cell[0]
+
+        chain_gotos = self._bypass_chains(actions, gotos)
+
+        self.defaults = array('i', [ 0 ]) * self.states
+        for state, row in enumerate(actions):
+            reductions = { entry for entry in row.values() if entry < 0 and entry != -(self.accept + 1) }
+            if len(reductions) == 1:
+                default, = reductions
+                self.defaults[state] = default
+                actions[state] = { t: entry for t, entry in row.items() if entry != default }
+
+        self.action_base, self.action_check, self.action_entries = self._pack(actions, self.width, check=True)
+        self.goto_base, _, self.goto_entries = self._pack(gotos, self.goto_width)
+        self.chain_base, _, self.chain_entries = self._pack(chain_gotos, self.goto_width)
+
+    def _bypass_chains(self, actions, gotos):
+        # left side of the unit production reduced by a chain state
+        chain = {}
+        for state, row in enumerate(actions):
+            entries = set(row.values())
+            if len(entries) != 1 or gotos[state]:
+                continue
+            entry, = entries
+            production = -entry - 1
+            if entry < 0 and production != self.accept and self.units[production]:
+                chain[state] = self.lhs[production]
+
+        # p --B--> q, q reduces A -> B: p goes straight to p --A-->
+        chain_gotos = []
+        for row in gotos:
+            chain_row = {}
+            for X, target in row.items():
+                while target in chain:
+                    target = row[chain[target]]
+                chain_row[X] = target
+            chain_gotos.append(chain_row)
+
+        return chain_gotos
+
+    @staticmethod
+    def _pack(rows, width, check=False):
+        """
+        Packs the {column: value} rows first fit, widest first.
+        Returns the base of every row, the check vector and the entries.
+        """
+        base = array('i', [ 0 ]) * len(rows)
+        # bitset of the used slots
+        used = 0
+
+        for state in sorted(range(len(rows)), key=lambda x: -len(rows[x])):
+            columns = rows[state]
+            if not columns:
+                continue
+            # bit `offset` is set if some column would land on a used slot
+            blocked = 0
+            for t in columns:
+                blocked |= used >> t
+            offset = base[state] = (~blocked & (blocked + 1)).bit_length() - 1
+            for t in columns:
+                used |= 1 << (offset + t)
+
+        size = max(base, default=0) + width
+        entries = array('i', [ 0 ]) * size
+        checks = array('i', [ -1 ]) * size if check else None
+        for state, columns in enumerate(rows):
+            for t, value in columns.items():
+                entries[base[state] + t] = value
+                if check:
+                    checks[base[state] + t] = state
+
+        return base, checks, entries
+
+    def action_at(self, state, t):
+        index = self.action_base[state] + t
+        return self.action_entries[index] if self.action_check[index] == state else self.defaults[state]
+
+    def goto_at(self, state, X):
+        return self.goto_entries[self.goto_base[state] + X]
+
+def lr_parse(table, tokens, errors=None):
+    """
+    Parses `tokens` on a ParsingTable in a single pass, running the rule of
+    every production as it is reduced over a stack of values.
+    Returns `(value, None)`, or `(None, token)` at the unexpected token.
+
+    `tokens` may be any iterable ending with EOF, e.g. a generator: it is
+    read with a single token of lookahead and a token is only kept while
+    it is on the stack (or in the value built from it).
+
+    If `errors` is a list, every unexpected token is appended to it and the
+    parser recovers as yacc does: it pops the stack down to a state that
+    shifts the `error` terminal, shifts it and then drops tokens until one
+    can follow. Errors are not reported again until three tokens are shifted,
+    and no rule runs past the first one.
+    """
+    base, check, entries, defaults = table.action_base, table.action_check, table.action_entries, table.defaults
+    goto_base, goto = table.chain_base, table.chain_entries
+    lhs, rhs, rules, units = table.lhs, table.rhs, table.rules, table.units
+    terminal_ids = table.terminal_ids
+    accept, error = table.accept, table.error
+
+    stack = [ 0 ]
+    values = [ None ]
+    tokens = iter(tokens)
+    token = next(tokens)
+    recovering = 0
+    first_error = None
+
+    while True:
+        try:
+            lookahead = terminal_ids[token.token_type]
+        except KeyError:
+            entry = 0
+        else:
+            state = stack[-1]
+            index = base[state] + lookahead
+            entry = entries[index] if check[index] == state else defaults[state]
+
+        while entry < 0:
+            production = -entry - 1
+            if production == accept:
+                return (values[-1], None) if first_error is None else (None, first_error)
+            if units[production]:
+                # the value stays as is, only the state changes
+                state = stack[-1] = goto[goto_base[stack[-2]] + lhs[production]]
+            else:
+                length = rhs[production]
+                if first_error is not None:
+                    # past a syntax error there is no value to build
+                    value = None
+                elif length:
+                    value = rules[production](None, [ None ] + values[-length:])
+                else:
+                    value = rules[production](None, None)
+                if length:
+                    del stack[-length:]
+                    del values[-length:]
+                state = goto[goto_base[stack[-1]] + lhs[production]]
+                stack.append(state)
+                values.append(value)
+            index = base[state] + lookahead
+            entry = entries[index] if check[index] == state else defaults[state]
+
+        if entry > 0:
+            stack.append(entry - 1)
+            values.append(token)
+            token = next(tokens)
+            if recovering:
+                recovering -= 1
+            continue
+
+        if errors is None:
+            return None, token
+
+        if recovering == 3:
+            # nothing was shifted since the last error: drop the token
+            token = next(tokens, None)
+            if token is None:
+                return None, first_error
+            continue
+
+        if not recovering:
+            errors.append(token)
+            if first_error is None:
+                first_error = token
+        recovering = 3
+
+        # shifts are never defaults, the error entry must be in the table
+        while error < 0 or check[base[stack[-1]] + error] != stack[-1] or entries[base[stack[-1]] + error] <= 0:
+            if len(stack) == 1:
+                return None, first_error
+            stack.pop()
+            values.pop()
+        stack.append(entries[base[stack[-1]] + error] - 1)
+        values.append(None)
+
 class ShiftReduceParser:  
-    def __init__(self, G, verbose=False):
+    TABLE_VERSION = 1
+
+    def __init__(self, G, verbose=False, cache_dir=None):
         self.G = G
         self.verbose = verbose
         self.action = {}
         self.goto = {}
-        self._build_parsing_table()
+
+        if cache_dir is None or not self._load_parsing_table(cache_dir):
+            self._build_parsing_table()
+            self._sort_conflicts()
+            if cache_dir is not None:
+                self._save_parsing_table(cache_dir)
+
+        self.table = ParsingTable(self)
     
     def _build_parsing_table(self):
         raise NotImplementedError()
 
-    def __call__(self, w):
-        stack = [ 0 ]
-        cursor = 0
-        output, operations = [], []
-        
-        while True:
-            state = stack[-1]
-            lookahead = w[cursor].token_type
-            if self.verbose: print(stack, w[cursor:])
-                
-            # (Detect error)
-            try:
-                action, tag = self.action[state][lookahead][0]
-                # (Shift case)
-                if action == Action.SHIFT:
-                    stack.append(tag)
-                    cursor += 1
-                    operations.append(action)
-                # (Reduce case)
-                elif action == Action.REDUCE:
-                    for _ in range(len(tag.Right)): stack.pop()
-                    stack.append(self.goto[stack[-1]][tag.Left][0])
-                    output.append(tag)
-                    operations.append(action)
-                # (OK case)
-                elif action == Action.OK:
-                    # output.reverse()
-                    return output, operations
-                # (Invalid case)
-                else:
-                    assert False, 'Must be something wrong!'
-            except KeyError:
-                # print('Parsing Error:', stack, w[cursor:])
-                return w[cursor:][0], None
+    def _sort_conflicts(self):
+        # conflicting cells are resolved taking the first action, so their order
+        # must not depend on set iteration: shift first (as yacc does), then
+        # accept, then reductions in the order the productions were declared
+        rank = { Action.SHIFT: 0, Action.OK: 1, Action.REDUCE: 2 }
+        index = { production: i for i, production in enumerate(self.G.Productions) }
 
-class LR1Parser(ShiftReduceParser):
-    @staticmethod
-    def expand(item, firsts):
-        next_symbol = item.NextSymbol
-        if next_symbol is None or not next_symbol.IsNonTerminal:
-            return []
-        
-        lookaheads = ContainerSet()
-        # (Compute lookahead for child items)
-        for preview in item.Preview():
-            lookaheads.hard_update(GrammarTools.compute_local_first(firsts, preview))
-        
-        assert not lookaheads.contains_epsilon
-        # (Build and return child items)
-        return [Item(prod, 0, lookaheads) for prod in next_symbol.productions]
+        for row in self.action.values():
+            for cell in row.values():
+                if len(cell) > 1:
+                    cell.sort(key=lambda x: (rank[x[0]], index.get(x[1], 0) if x[0] == Action.REDUCE else x[1] or 0))
 
-    @staticmethod
-    def compress(items):
-        centers = {}
+    def _table_signature(self):
+        digest = hashlib.sha1()
+        digest.update(f'{type(self).__name__}:{self.TABLE_VERSION}'.encode())
+        digest.update(self.G.to_json.encode())
+        for production in self.G.Productions:
+            for rule in getattr(production, 'attributes', ()):
+                digest.update(GrammarTools.rule_identity(rule))
+        return digest.hexdigest()
 
-        for item in items:
-            center = item.Center()
-            try:
-                lookaheads = centers[center]
-            except KeyError:
-                centers[center] = lookaheads = set()
-            lookaheads.update(item.lookaheads)
-        
-        return { Item(x.production, x.pos, set(lookahead)) for x, lookahead in centers.items() }
+    def _table_path(self, cache_dir, signature):
+        return os.path.join(cache_dir, f'{type(self).__name__}-{signature[:16]}.json')
 
-    @staticmethod
-    def closure_lr1(items, firsts):
-        closure = ContainerSet(*items)
-        
-        changed = True
-        while changed:
-            changed = False
-            
-            new_items = ContainerSet()
-            for item in closure:
-                new_items.extend(LR1Parser.expand(item, firsts))
+    def _save_parsing_table(self, cache_dir):
+        signature = self._table_signature()
+        index = { production: i for i, production in enumerate(self.G.Productions) }
 
-            changed = closure.update(new_items)
-            
-        return LR1Parser.compress(closure)
-    
-    @staticmethod
-    def goto_lr1(items, symbol, firsts=None, just_kernel=False):
-        assert just_kernel or firsts is not None, '`firsts` must be provided if `just_kernel=False`'
-        items = frozenset(item.NextItem() for item in items if item.NextSymbol == symbol)
-        return items if just_kernel else LR1Parser.closure_lr1(items, firsts)
+        def encode(action, tag):
+            return [action, index[tag] if action == Action.REDUCE else tag]
 
+        data = {
+            'version': self.TABLE_VERSION,
+            'signature': signature,
+            'action': { state: { symbol.Name: [encode(*x) for x in cell] for symbol, cell in row.items() } for state, row in self.action.items() },
+            'goto': { state: { symbol.Name: cell for symbol, cell in row.items() } for state, row in self.goto.items() },
+        }
 
-    def build_LR1_automaton(self):
-        G = self.augmentedG = self.G.AugmentedGrammar(True)
+        path = self._table_path(cache_dir, signature)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # write and rename, so concurrent compilers never read a partial table
+            tmp = f'{path}.{os.getpid()}.tmp'
+            with open(tmp, 'w') as fd:
+                json.dump(data, fd)
+            os.replace(tmp, path)
+        except OSError:
+            pass
 
-        firsts = GrammarTools.compute_firsts(G)
-        firsts[G.EOF] = ContainerSet(G.EOF)
-        
-        start_production = G.startSymbol.productions[0]
-        start_item = Item(start_production, 0, lookaheads=(G.EOF,))
-        start = frozenset([start_item])
-        
-        closure = LR1Parser.closure_lr1(start, firsts)
-        automaton = State(frozenset(closure), True)
-        
-        pending = [ start ]
-        visited = { start: automaton }
-        
-        while pending:
-            current = pending.pop()
-            current_state = visited[current]
-            
-            for symbol in G.terminals + G.nonTerminals:
-                # (Get/Build `next_state`)
-                kernels = LR1Parser.goto_lr1(current_state.state, symbol, just_kernel=True)
-                
-                if not kernels:
-                    continue
-                
-                try:
-                    next_state = visited[kernels]
-                except KeyError:
-                    pending.append(kernels)
-                    visited[pending[-1]] = next_state = State(frozenset(LR1Parser.goto_lr1(current_state.state, symbol, firsts)), True)
-                
-                current_state.add_transition(symbol.Name, next_state)
-        
-        # automaton.set_formatter(empty_formatter)
-        self.automaton = automaton
+    def _load_parsing_table(self, cache_dir):
+        signature = self._table_signature()
+        try:
+            with open(self._table_path(cache_dir, signature)) as fd:
+                data = json.load(fd)
+        except (OSError, ValueError):
+            return False
 
-    def _build_parsing_table(self):
-        self.is_lr1 = True
-        self.build_LR1_automaton()
-        
-        for i, node in enumerate(self.automaton):
+        if not isinstance(data, dict) or data.get('version') != self.TABLE_VERSION or data.get('signature') != signature:
+            return False
+
+        productions = self.G.Productions
+
+        def symbol(name):
+            value = self.G[name]
+            if value is None:
+                raise KeyError(name)
+            return value
+
+        def decode(action, tag):
+            return Action((action, productions[tag] if action == Action.REDUCE else tag))
+
+        try:
+            action = { int(state): { symbol(name): [decode(*x) for x in cell] for name, cell in row.items() } for state, row in data['action'].items() }
+            goto = { int(state): { symbol(name): cell for name, cell in row.items() } for state, row in data['goto'].items() }
+        except (KeyError, IndexError, TypeError, ValueError):
+            return False
+
+        self.action, self.goto = action, goto
+        return True
+
+    @property
+    def conflicts(self):
+        return [ (state, symbol, cell) for state, row in self.action.items() for symbol, cell in row.items() if len(cell) > 1 ]
+
+    def _fill_parsing_table(self):
+        """
+        Fills `action` and `goto` from `self.automaton`, whose
+        items must carry their lookaheads.
+        Returns False if some cell got more than one entry.
+        """
+        G = self.augmentedG
+        deterministic = True
+        nodes = list(self.automaton)
+
+        for i, node in enumerate(nodes):
             if self.verbose: print(i, '\t', '\n\t '.join(str(x) for x in node.state), '\n')
             node.idx = i
             node.tag = f'I{i}'
 
-        for node in self.automaton:
+        for node in nodes:
             idx = node.idx
             for item in node.state:
-                # - Fill `self.Action` and `self.Goto` according to `item`)
-                # - Feel free to use `self._register(...)`)
                 if item.IsReduceItem:
                     prod = item.production
-                    if prod.Left == self.augmentedG.startSymbol:
-                        self.is_lr1 &= GrammarTools._register(self.action, idx, self.augmentedG.EOF, 
+                    if prod.Left == G.startSymbol:
+                        deterministic &= GrammarTools._register(self.action, idx, G.EOF, 
                                                             Action((Action.OK, '')))
                     else:
                         for lookahead in item.lookaheads:
-                            self.is_lr1 &= GrammarTools._register(self.action, idx, lookahead, 
+                            deterministic &= GrammarTools._register(self.action, idx, lookahead, 
                                                                 Action((Action.REDUCE, prod)))
                 else:
                     next_symbol = item.NextSymbol
                     if next_symbol.IsTerminal:
-                        self.is_lr1 &= GrammarTools._register(self.action, idx, next_symbol, 
+                        deterministic &= GrammarTools._register(self.action, idx, next_symbol, 
                                                             Action((Action.SHIFT, node[next_symbol.Name][0].idx)))
                     else:
-                        self.is_lr1 &= GrammarTools._register(self.goto, idx, next_symbol, 
+                        deterministic &= GrammarTools._register(self.goto, idx, next_symbol, 
                                                             node[next_symbol.Name][0].idx)
-                pass
\ No newline at end of file
+
+        return deterministic
+
+    def parse(self, w, errors=None):
+        """
+        Builds the value of the start symbol (e.g. the AST) while parsing
+        `w`, which may be a stream of tokens.
+        Returns `(value, None)`, or `(None, token)` at the first unexpected
+        token. Given an `errors` list, recovers and collects all of them.
+        """
+        return lr_parse(self.table, w, errors)
+
+    def __call__(self, w):
+        table = self.table
+        action, goto = table.action_at, table.goto_at
+        lhs, rhs = table.lhs, table.rhs
+        terminal_ids = table.terminal_ids
+        productions = table.productions
+        accept = table.accept
+        verbose = self.verbose
+
+        stack = [ 0 ]
+        cursor = 0
+        output, operations = [], []
+        shift, reduce = Action.SHIFT, Action.REDUCE
+        
+        while True:
+            if verbose: print(stack, w[cursor:])
+
+            # (Detect error)
+            try:
+                lookahead = terminal_ids[w[cursor].token_type]
+            except KeyError:
+                return w[cursor], None
+
+            entry = action(stack[-1], lookahead)
+
+            # (Reduce case), until the lookahead gets shifted
+            while entry < 0:
+                production = -entry - 1
+                # (OK case)
+                if production == accept:
+                    return output, operations
+                length = rhs[production]
+                if length:
+                    del stack[-length:]
+                state = goto(stack[-1], lhs[production])
+                stack.append(state)
+                output.append(productions[production])
+                operations.append(reduce)
+                entry = action(state, lookahead)
+
+            # (Shift case)
+            if entry > 0:
+                stack.append(entry - 1)
+                cursor += 1
+                operations.append(shift)
+            # (Invalid case)
+            else:
+                # print('Parsing Error:', stack, w[cursor:])
+                return w[cursor], None
+
+class LRItems:
+    """
+    Integer coding of the LR(0) items of a grammar, to build its automata.
+
+    The items of the production `p` are `offset[p]` (dot first) up to
+    `offset[p] + len(p.Right)`, so the item after `i` is `i + 1`. Symbols are
+    numbered terminals first (EOF last) and a set of lookaheads is an int
+    whose bit `t` stands for the terminal `t`.
+    """
+    def __init__(self, G, analysis):
+        self.terminals = analysis.terminals
+        self.symbols = analysis.symbols
+        self.productions = G.Productions
+        symbol_ids = analysis.symbol_ids
+        terminal_count = len(self.terminals)
+
+        self.offset = []
+        self.production, self.pos, self.next_symbol = [], [], []
+        # First(beta) and beta ->* epsilon of every item A -> alpha . X beta
+        self.suffix_first, self.suffix_nullable = [], []
+
+        for index, production in enumerate(self.productions):
+            right = production.Right
+            self.offset.append(len(self.production))
+
+            suffixes = []
+            first, nullable = 0, True
+            for X in reversed(right):
+                suffixes.append((first, nullable))
+                first, nullable = analysis.prepend(symbol_ids[X], first, nullable)
+            suffixes.reverse()
+
+            for pos in range(len(right) + 1):
+                self.production.append(index)
+                self.pos.append(pos)
+                self.next_symbol.append(symbol_ids[right[pos]] if pos < len(right) else -1)
+                self.suffix_first.append(suffixes[pos][0] if pos < len(right) else 0)
+                self.suffix_nullable.append(suffixes[pos][1] if pos < len(right) else False)
+
+        self.next_item = [ i + 1 if X >= 0 else -1 for i, X in enumerate(self.next_symbol) ]
+
+        # items X -> . alpha of every non-terminal X
+        self.children = [ () ] * terminal_count + [ tuple(self.offset[self.productions.index(p)] for p in X.productions) for X in G.nonTerminals ]
+        self.nonterminal_start = terminal_count
+        self.start = self.offset[self.productions.index(G.startSymbol.productions[0])]
+        self._lookaheads = {}
+
+    def bit(self, terminal):
+        return 1 << self.terminals.index(terminal)
+
+    def closure_lr0(self, kernel):
+        closure = set(kernel)
+        next_symbol, children = self.next_symbol, self.children
+        nonterminal_start = self.nonterminal_start
+
+        pending = list(kernel)
+        while pending:
+            symbol = next_symbol[pending.pop()]
+            if symbol < nonterminal_start:
+                continue
+            for child in children[symbol]:
+                if child not in closure:
+                    closure.add(child)
+                    pending.append(child)
+
+        return frozenset(closure)
+
+    @property
+    def closure_tables(self):
+        """
+        The arrays `closure_lr1` needs, which can be sent to other processes.
+        """
+        return self.next_symbol, self.children, self.suffix_first, self.suffix_nullable, self.nonterminal_start
+
+    def closure_lr1(self, kernel):
+        """
+        Closure of `kernel`, a dict from items to their lookaheads.
+        """
+        return closure_lr1(self.closure_tables, kernel)
+
+    def lookaheads(self, bits):
+        try:
+            return self._lookaheads[bits]
+        except KeyError:
+            terminals = self._lookaheads[bits] = frozenset(t for i, t in enumerate(self.terminals) if bits >> i & 1)
+            return terminals
+
+    def item(self, item, lookaheads=0):
+        return Item(self.productions[self.production[item]], self.pos[item], self.lookaheads(lookaheads))
+
+def closure_lr1(tables, kernel):
+    """
+    Closure of `kernel`, (item, lookaheads) pairs or a dict from items to
+    their lookaheads, over the `LRItems.closure_tables` of a grammar.
+    """
+    next_symbol, children, suffix_first, suffix_nullable, nonterminal_start = tables
+    closure = dict(kernel)
+
+    pending = list(closure)
+    while pending:
+        item = pending.pop()
+        if next_symbol[item] < nonterminal_start:
+            continue
+
+        lookaheads = suffix_first[item]
+        if suffix_nullable[item]:
+            lookaheads |= closure[item]
+
+        for child in children[next_symbol[item]]:
+            current = closure.get(child, 0)
+            if current | lookaheads != current:
+                closure[child] = current | lookaheads
+                pending.append(child)
+
+    return closure
+
+# closure tables of the grammar a worker process builds automata for
+_worker_tables = None
+
+def _init_closure_worker(tables):
+    global _worker_tables
+    _worker_tables = tables
+
+def _closure_worker(kernels):
+    return [ closure_lr1(_worker_tables, kernel) for kernel in kernels ]
+
+class LR1Parser(ShiftReduceParser):
+    # frontiers smaller than this are closed in the current process
+    PARALLEL_FRONTIER = 64
+
+    def __init__(self, G, verbose=False, cache_dir=None, workers=None):
+        """
+        With `workers` > 1 the closures of the automaton are
+        computed by that many processes.
+        """
+        self.workers = workers
+        super().__init__(G, verbose, cache_dir)
+
+    def build_LR1_automaton(self):
+        G = self.augmentedG = self.G.AugmentedGrammar(True)
+        items = LRItems(G, GrammarAnalysis(G))
+        next_symbol, next_item = items.next_symbol, items.next_item
+
+        pool = None
+        if self.workers and self.workers > 1:
+            # multiprocessing is only imported by the builds that use it
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(self.workers, initializer=_init_closure_worker, initargs=(items.closure_tables,))
+
+        start = frozenset([ (items.start, items.bit(G.EOF)) ])
+        closures, transitions = { start: None }, {}
+
+        # breadth first, a frontier at a time: states are numbered later
+        # from the transitions, so the order kernels are closed in is free
+        frontier = [ start ]
+        try:
+            while frontier:
+                pending = []
+                for kernel, closure in zip(frontier, self._closures(items, frontier, pool)):
+                    closures[kernel] = closure
+
+                    # kernels of every goto in a single pass over the items
+                    gotos = {}
+                    for item, lookaheads in closure.items():
+                        symbol = next_symbol[item]
+                        if symbol >= 0:
+                            gotos.setdefault(symbol, []).append((next_item[item], lookaheads))
+
+                    transitions[kernel] = edges = []
+                    for symbol in sorted(gotos):
+                        target = frozenset(gotos[symbol])
+                        edges.append((items.symbols[symbol].Name, target))
+                        if target not in closures:
+                            closures[target] = None
+                            pending.append(target)
+                frontier = pending
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        states = { kernel: State(frozenset(items.item(*x) for x in closure.items()), True) for kernel, closure in closures.items() }
+        for kernel, edges in transitions.items():
+            for symbol, target in edges:
+                states[kernel].add_transition(symbol, states[target])
+
+        # automaton.set_formatter(empty_formatter)
+        self.automaton = states[start]
+
+    def _closures(self, items, kernels, pool):
+        if pool is None or len(kernels) < self.PARALLEL_FRONTIER:
+            return [ items.closure_lr1(kernel) for kernel in kernels ]
+
+        size = -(-len(kernels) // (4 * self.workers))
+        chunks = [ kernels[i:i + size] for i in range(0, len(kernels), size) ]
+        return [ closure for chunk in pool.map(_closure_worker, chunks) for closure in chunk ]
+
+    def _build_parsing_table(self):
+        self.build_LR1_automaton()
+        self.is_lr1 = self._fill_parsing_table()
+
+    def _load_parsing_table(self, cache_dir):
+        loaded = super()._load_parsing_table(cache_dir)
+        if loaded:
+            self.is_lr1 = not self.conflicts
+        return loaded
+
+
+class LALR1Parser(ShiftReduceParser):
+    def build_LR0_automaton(self):
+        G = self.augmentedG = self.G.AugmentedGrammar(True)
+        items = LRItems(G, GrammarAnalysis(G))
+        next_symbol, next_item = items.next_symbol, items.next_item
+
+        start = frozenset([ items.start ])
+        closures, transitions = {}, {}
+
+        pending = [ start ]
+        while pending:
+            kernel = pending.pop()
+            closure = closures[kernel] = items.closure_lr0(kernel)
+
+            gotos = {}
+            for item in closure:
+                symbol = next_symbol[item]
+                if symbol >= 0:
+                    gotos.setdefault(symbol, []).append(next_item[item])
+
+            transitions[kernel] = edges = []
+            for symbol in sorted(gotos):
+                target = frozenset(gotos[symbol])
+                edges.append((items.symbols[symbol].Name, target))
+                if target not in closures:
+                    closures[target] = None
+                    pending.append(target)
+
+        states = { kernel: State(frozenset(items.item(x) for x in closure), True) for kernel, closure in closures.items() }
+        for kernel, edges in transitions.items():
+            for symbol, target in edges:
+                states[kernel].add_transition(symbol, states[target])
+
+        self.automaton = states[start]
+
+    def compute_lookaheads(self):
+        """
+        Computes LA(q, A -> w) for every reduce item of the LR(0)
+        automaton using the DeRemer & Pennello relations.
+        """
+        G = self.augmentedG
+        analysis = GrammarAnalysis(G)
+        nullable = { analysis.symbols[X] for X in analysis.nullable }
+
+        # (p, A) for every transition of p over a non-terminal A
+        transitions = [ (p, A) for p in self.automaton for A in G.nonTerminals if p.has_transition(A.Name) ]
+
+        direct_reads, reads, includes, lookback = {}, {}, {}, {}
+        for p, A in transitions:
+            r = p.get(A.Name)
+
+            # DR(p, A) = { t | r --t--> }, accepting counts as reading EOF
+            direct_reads[p, A] = { t for t in G.terminals if r.has_transition(t.Name) }
+            if any(item.IsReduceItem and item.production.Left == G.startSymbol for item in r.state):
+                direct_reads[p, A].add(G.EOF)
+
+            # (p, A) reads (r, C) iff r --C--> and C ->* epsilon
+            reads[p, A] = [ (r, C) for C in nullable if r.has_transition(C.Name) ]
+
+            # A -> w, p --w--> q: (q, A -> w) lookback (p, A)
+            # A -> b B g, g ->* epsilon, p --b--> q: (q, B) includes (p, A)
+            for prod in A.productions:
+                q = p
+                for i, symbol in enumerate(prod.Right):
+                    if symbol.IsNonTerminal and all(x in nullable for x in prod.Right[i + 1:]):
+                        includes.setdefault((q, symbol), []).append((p, A))
+                    q = q.get(symbol.Name)
+                lookback.setdefault((q, prod), []).append((p, A))
+
+        read = GrammarTools.digraph(transitions, reads, direct_reads)
+        follow = GrammarTools.digraph(transitions, includes, read)
+
+        return { key: set().union(*(follow[x] for x in values)) for key, values in lookback.items() }
+
+    def _build_parsing_table(self):
+        self.build_LR0_automaton()
+        lookaheads = self.compute_lookaheads()
+
+        for node in list(self.automaton):
+            node.state = frozenset(Item(item.production, item.pos, lookaheads.get((node, item.production), ())) if item.IsReduceItem else item for item in node.state)
+
+        self.is_lalr1 = self._fill_parsing_table()
+        if self.verbose:
+            for state, symbol, cell in self.conflicts:
+                print('Conflict at', state, symbol, cell)
+
+    def _load_parsing_table(self, cache_dir):
+        loaded = super()._load_parsing_table(cache_dir)
+        if loaded:
+            self.is_lalr1 = not self.conflicts
+        return loaded
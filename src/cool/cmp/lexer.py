@@ -0,0 +1,83 @@
+from .automata import State
+from .regex import OTHER, regex_automaton
+
+__all__ = ['Lexer']
+
+class _CharClasses(dict):
+    # `str.translate` table to character classes, every character out of ASCII is `OTHER`
+    def __missing__(self, char):
+        return self[ord(OTHER)]
+
+class Lexer:
+    """
+    Maximal munch lexer over the minimal DFA of `rules`, a list of `(tag,
+    pattern)` where the first rule wins a tie (see `regex_automaton` for the
+    syntax of the patterns).
+
+    The characters are numbered by classes of characters with the same
+    transitions, and `encode` turns a text into the bytes of its classes
+    (plus an end mark). The states are numbered by rows of `width` entries:
+    the row after `row` on the class `c` is `transitions[row + c]`, or -1 if
+    there is none, and `accepts[row]` is the tag of the row or None. The
+    start is the row 0.
+    """
+    def __init__(self, rules):
+        self.tags = [ tag for tag, _ in rules ]
+
+        start = State('start')
+        priority = {}
+        for i, (_, pattern) in enumerate(rules):
+            rule_start, rule_final = regex_automaton(pattern)
+            rule_final.final = True
+            priority[rule_final] = i
+            start.add_epsilon_transition(rule_start)
+
+        # the rule of a state of the DFA, the first one among its NFA finals
+        def rule_of(state):
+            return min((priority[s] for s in state.state if s in priority), default=-1)
+
+        dfa = start.to_deterministic().minimize(key=rule_of)
+        states, symbols, moves = dfa.to_arrays()
+        accepts = [ rule_of(state.state[0]) for state in states ]
+        count = len(symbols)
+
+        # the columns of the same moves make up a class of characters, the
+        # characters of no rule share the (dead) class of the end mark
+        columns = { (-1,) * len(states): 0 }
+        column_ids = [ columns.setdefault(tuple(moves[j::count]), len(columns)) for j in range(count) ]
+        self.width = width = len(columns)
+
+        classes = dict.fromkeys(range(129), 0)
+        classes.update((ord(symbol), column_ids[j]) for j, symbol in enumerate(symbols))
+        self.classes = _CharClasses(classes)
+
+        self.transitions = [-1] * (len(states) * width)
+        for i in range(len(states)):
+            for j in range(count):
+                target = moves[i * count + j]
+                self.transitions[i * width + column_ids[j]] = -1 if target < 0 else target * width
+
+        self.accepts = [None] * len(self.transitions)
+        for i, rule in enumerate(accepts):
+            if rule >= 0:
+                self.accepts[i * width] = self.tags[rule]
+
+    def encode(self, text):
+        return text.translate(self.classes).encode('latin-1') + b'\0'
+
+    def match(self, codes, pos):
+        """
+        Tag and end of the longest match at `pos` of the `encode`d text,
+        `(None, pos)` if there is none.
+        """
+        transitions, accepts = self.transitions, self.accepts
+        tag, end = None, pos
+        row = transitions[codes[pos]]
+
+        while row >= 0:
+            pos += 1
+            if accepts[row] is not None:
+                tag, end = accepts[row], pos
+            row = transitions[row + codes[pos]]
+
+        return tag, end
@@ -0,0 +1,141 @@
+import os
+import ast
+import inspect
+import hashlib
+import builtins
+import textwrap
+from .grammartools import lr_parse
+
+HEADER = '''\
+# Generated by cool.cmp.parsergen, do not edit.
+# Tables and semantic rules of %(grammar)s, see `make`.
+import os
+import hashlib
+from array import array
+from types import SimpleNamespace
+%(imports)s
+
+SIGNATURE = %(signature)r
+SOURCES = %(sources)r
+
+TERMINALS = %(terminals)r
+ACCEPT = %(accept)d
+ERROR = %(error)d
+
+LHS = %(lhs)s
+RHS = %(rhs)s
+UNITS = %(units)s
+DEFAULTS = %(defaults)s
+ACTION_BASE = %(action_base)s
+ACTION_CHECK = %(action_check)s
+ACTION_ENTRIES = %(action_entries)s
+GOTO_BASE = %(goto_base)s
+GOTO_ENTRIES = %(goto_entries)s
+
+RULES = (
+%(rules)s
+)
+'''
+
+FUNCTIONS = '''
+def up_to_date():
+    """
+    Checks that the sources this module was generated from did not change.
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha1()
+    try:
+        for source in SOURCES:
+            with open(os.path.join(root, source), 'rb') as fd:
+                digest.update(fd.read())
+    except OSError:
+        return False
+    return digest.hexdigest() == SIGNATURE
+
+TABLE = SimpleNamespace(defaults=DEFAULTS, action_base=ACTION_BASE, action_check=ACTION_CHECK, action_entries=ACTION_ENTRIES,
+                        chain_base=GOTO_BASE, chain_entries=GOTO_ENTRIES, lhs=LHS, rhs=RHS, units=UNITS, rules=RULES,
+                        terminal_ids=TERMINALS, accept=ACCEPT, error=ERROR)
+
+def parse(tokens, errors=None):
+    """
+    Parses `tokens`, whose `token_type` is the name of a terminal.
+    Returns `(value, None)`, or `(None, token)` at the first unexpected
+    token. Given an `errors` list, recovers and collects all of them.
+    """
+    return lr_parse(TABLE, tokens, errors)
+
+%(driver)s'''
+
+def source_signature(root, sources):
+    digest = hashlib.sha1()
+    for source in sources:
+        with open(os.path.join(root, source), 'rb') as fd:
+            digest.update(fd.read())
+    return digest.hexdigest()
+
+def rule_source(rule):
+    """
+    Source of a semantic rule written as a one-line lambda,
+    along with the global names it uses.
+    """
+    line = textwrap.dedent(''.join(inspect.getsourcelines(rule)[0]))
+    lambdas = [ node for node in ast.walk(ast.parse(line)) if isinstance(node, ast.Lambda) ]
+    if len(lambdas) != 1:
+        raise ValueError(f'Cannot extract the source of {rule} ({rule.__code__.co_filename}:{rule.__code__.co_firstlineno})')
+
+    node, = lambdas
+    params = { arg.arg for arg in node.args.args }
+    names = { x.id for x in ast.walk(node.body) if isinstance(x, ast.Name) and x.id not in params }
+    return ast.get_source_segment(line, node), names
+
+def format_array(values, indent=4, width=100, typecode='i'):
+    body = textwrap.fill(', '.join(map(str, values)), width, initial_indent=' ' * indent, subsequent_indent=' ' * indent)
+    return f"array('{typecode}', [\n{body}\n])"
+
+def generate_parser_module(parser, root, sources):
+    """
+    Source of a standalone module with the tables of `parser` and the
+    semantic rules of its grammar, plus `parse(tokens)` and `up_to_date()`.
+    `sources` (relative to `root`, where the module will live) are the
+    files whose changes must invalidate it.
+    """
+    table = parser.table
+    imports, rules = {}, []
+    for production in table.productions:
+        rule = production.attributes[0]
+        source, names = rule_source(rule)
+        for name in names:
+            value = rule.__globals__.get(name, getattr(builtins, name, None))
+            if value is None:
+                raise NameError(f'Unknown name "{name}" in the rule of {production}')
+            if not hasattr(builtins, name):
+                imports.setdefault(value.__module__, set()).add(name)
+        rules.append(f'    {source}, # {production}')
+
+    return HEADER % {
+        'grammar': parser.G.startSymbol,
+        'imports': '\n'.join(f'from {module} import {", ".join(sorted(names))}' for module, names in sorted(imports.items())),
+        'signature': source_signature(root, sources),
+        'sources': tuple(sources),
+        'terminals': { t.Name: i for i, t in enumerate(table.terminals) },
+        'accept': table.accept,
+        'error': table.error,
+        'lhs': format_array(table.lhs),
+        'rhs': format_array(table.rhs),
+        'units': format_array(table.units, typecode='b'),
+        'defaults': format_array(table.defaults),
+        'action_base': format_array(table.action_base),
+        'action_check': format_array(table.action_check),
+        'action_entries': format_array(table.action_entries),
+        'goto_base': format_array(table.chain_base),
+        'goto_entries': format_array(table.chain_entries),
+        'rules': '\n'.join(rules),
+    } + FUNCTIONS % { 'driver': inspect.getsource(lr_parse) }
+
+def write_parser_module(parser, path, sources):
+    root = os.path.dirname(os.path.abspath(path))
+    code = generate_parser_module(parser, root, sources)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fd:
+        fd.write(code)
+    os.replace(tmp, path)
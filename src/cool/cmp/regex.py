@@ -0,0 +1,131 @@
+from itertools import count
+from .automata import State
+
+__all__ = ['regex_automaton']
+
+# the symbols of the automata, ASCII plus `OTHER`, which stands for any other character
+OTHER = chr(128)
+ALPHABET = frozenset(map(chr, range(129)))
+
+ESCAPES = { 'n': '\n', 't': '\t', 'r': '\r', 'f': '\f', 'v': '\v', '0': '\0' }
+
+def regex_automaton(pattern):
+    """
+    `(start, final)` states of a Thompson NFA for `pattern`.
+
+    The syntax is a subset of `re`: `|`, `*`, `+`, `?`, groups, `.` (but a
+    newline), classes with ranges and `^`, and `\\` escaping a character or
+    standing for `\\n`, `\\t`, `\\r`, `\\f`, `\\v` or `\\0`.
+    """
+    parser = _RegexParser(pattern)
+    start, final = parser.union()
+    if parser.pos != len(pattern):
+        raise ValueError(f'Unexpected {pattern[parser.pos]!r} at {parser.pos} in {pattern!r}')
+    return start, final
+
+class _RegexParser:
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.pos = 0
+        self.ids = count()
+
+    def state(self):
+        return State(next(self.ids))
+
+    def peek(self):
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def next(self):
+        char = self.peek()
+        if char is None:
+            raise ValueError(f'Unexpected end of {self.pattern!r}')
+        self.pos += 1
+        return char
+
+    def union(self):
+        branches = [ self.concat() ]
+        while self.peek() == '|':
+            self.pos += 1
+            branches.append(self.concat())
+
+        if len(branches) == 1:
+            return branches[0]
+
+        start, final = self.state(), self.state()
+        for branch_start, branch_final in branches:
+            start.add_epsilon_transition(branch_start)
+            branch_final.add_epsilon_transition(final)
+        return start, final
+
+    def concat(self):
+        start = final = self.state()
+        while self.peek() not in (None, '|', ')'):
+            factor_start, factor_final = self.repeat()
+            final.add_epsilon_transition(factor_start)
+            final = factor_final
+        return start, final
+
+    def repeat(self):
+        start, final = self.atom()
+        while self.peek() in ('*', '+', '?'):
+            op = self.next()
+            outer_start, outer_final = self.state(), self.state()
+            outer_start.add_epsilon_transition(start)
+            final.add_epsilon_transition(outer_final)
+            if op != '+':
+                outer_start.add_epsilon_transition(outer_final)
+            if op != '?':
+                final.add_epsilon_transition(start)
+            start, final = outer_start, outer_final
+        return start, final
+
+    def atom(self):
+        char = self.next()
+        if char == '(':
+            fragment = self.union()
+            if self.next() != ')':
+                raise ValueError(f'Missing ) in {self.pattern!r}')
+            return fragment
+
+        if char == '[':
+            symbols = self.char_class()
+        elif char == '.':
+            symbols = ALPHABET - { '\n' }
+        elif char == '\\':
+            symbols = { self.escape() }
+        elif char in '*+?|)':
+            raise ValueError(f'Unexpected {char!r} at {self.pos - 1} in {self.pattern!r}')
+        else:
+            symbols = { char }
+
+        if not symbols <= ALPHABET:
+            raise ValueError(f'Only ASCII characters can be matched in {self.pattern!r}')
+
+        start, final = self.state(), self.state()
+        for symbol in symbols:
+            start.add_transition(symbol, final)
+        return start, final
+
+    def escape(self):
+        char = self.next()
+        return ESCAPES.get(char, char)
+
+    def char_class(self):
+        negated = self.peek() == '^'
+        if negated:
+            self.pos += 1
+
+        symbols = set()
+        first = True
+        while first or self.peek() != ']':
+            first = False
+            low = self.escape() if self.next() == '\\' else self.pattern[self.pos - 1]
+            if self.peek() == '-' and self.pos + 1 < len(self.pattern) and self.pattern[self.pos + 1] != ']':
+                self.pos += 1
+                high = self.escape() if self.next() == '\\' else self.pattern[self.pos - 1]
+                symbols.update(map(chr, range(ord(low), ord(high) + 1)))
+            else:
+                symbols.add(low)
+        self.pos += 1
+
+        return ALPHABET - symbols if negated else symbols
@@ -1,3 +1,7 @@
+import importlib
+import threading
+from functools import wraps
+
 class ContainerSet:
     def __init__(self, *values, contains_epsilon=False):
         self.set = set(values)
@@ -86,3 +90,49 @@ class Token:
     @property
     def is_valid(self):
         return True
+
+def append(items, item):
+    """
+    Appends `item` to `items` in place and returns `items`, so left
+    recursive list productions build their lists in linear time:
+
+        X %= X + Y, lambda h, s: append(s[1], s[2])
+    """
+    items.append(item)
+    return items
+
+
+def once(function):
+    """
+    `function()` computed on the first call and shared by the later ones,
+    which wait for it if it is still being computed.
+    """
+    lock = threading.Lock()
+    result = []
+
+    @wraps(function)
+    def wrapper():
+        if not result:
+            with lock:
+                if not result:
+                    result.append(function())
+        return result[0]
+    return wrapper
+
+def lazy_getattr(package, exports):
+    """
+    Module `__getattr__` of `package` that imports the submodule with an
+    exported name on its first use. `exports` maps every submodule to the
+    names it exports.
+    """
+    modules = { name: module for module, names in exports.items() for name in names }
+
+    def __getattr__(name):
+        try:
+            module = modules[name]
+        except KeyError:
+            raise AttributeError(f'module {package!r} has no attribute {name!r}') from None
+        value = getattr(importlib.import_module(f'{package}.{module}'), name)
+        setattr(importlib.import_module(package), name, value)
+        return value
+    return __getattr__
@@ -0,0 +1,118 @@
+import os
+from itertools import chain
+from .errors import CompilerError, SyntacticError
+from .cmp import Token
+from .lexer import tokenizer
+from . import load_parser
+
+# the phases of a compile, in order
+PHASES = ('lexer', 'parser', 'semantic')
+
+# goes through every phase, see `warm_up`
+WARM_UP = 'class Main inherits IO { main() : IO { out_string("warm") }; };'
+
+class Compilation:
+    """
+    Result of `compile_source`: the `errors` (`COOLError`s, the ones that
+    CoolCompiler.py reports) and what the phases up to `phase`, the last one
+    that ran, left behind: the `tokens` (only kept if it stopped after the
+    lexer), the `ast`, and the `context` and `scope` of the semantic check.
+    """
+    def __init__(self, phase, errors, tokens=None, ast=None, context=None, scope=None):
+        self.phase = phase
+        self.errors = errors
+        self.tokens = tokens
+        self.ast = ast
+        self.context = context
+        self.scope = scope
+
+    @property
+    def status(self):
+        """
+        Exit status of CoolCompiler.py.
+        """
+        return 1 if self.errors else 0
+
+def compile_source(text, *, stop_after='semantic'):
+    """
+    Compiles the COOL program `text` through the phase `stop_after` (see
+    `PHASES`), or up to the first one with errors, into a `Compilation`.
+
+    It neither prints nor exits, and every call has its own lexer, visitors
+    and context, so it can be called over and over, from several threads.
+    """
+    if stop_after not in PHASES:
+        raise ValueError(f'Unknown phase {stop_after!r}, expected one of {PHASES}')
+
+    # Lexer ...
+    if stop_after == 'lexer':
+        errors, tokens = tokenizer(text, max_errors=1)
+        return Compilation('lexer', errors, tokens=tokens)
+
+    # the lexer feeds the parser as it goes, tokens are not kept around,
+    # and it stops at the first lexical error, the only one reported
+    terrors, tokens = tokenizer(text, stream=True, max_errors=1)
+    tokens = chain(tokens, [Token('$', '$')])
+
+    # Parser ...
+    parse = load_parser()
+    unexpected = []
+    ast, token = parse(tokens, unexpected)
+
+    # lexical errors come first, the parser may have stopped before the end
+    for _ in tokens:
+        pass
+
+    if terrors:
+        return Compilation('lexer', terrors[:1])
+
+    if token:
+        errors = [ SyntacticError((token.line, token.column), 'No se esperaba el token ' + str(token.lex)) for token in unexpected ]
+        return Compilation('parser', errors)
+
+    if stop_after == 'parser':
+        return Compilation('parser', [], ast=ast)
+
+    # Semantic ...
+    # the visitors are only imported by the programs that get here
+    from . import TypeCollector, TypeBuilder, TypeChecker
+
+    errors = []
+    collector = TypeCollector(errors)
+    collector.visit(ast)
+    context = collector.context
+
+    builder = TypeBuilder(context, errors)
+    builder.visit(ast)
+
+    checker = TypeChecker(context, errors)
+    scope = checker.visit(ast)
+
+    return Compilation('semantic', errors, ast=ast, context=context, scope=scope)
+
+def warm_up():
+    """
+    Loads everything a compile needs, the lexer, the parser and the
+    visitors, for the processes that compile many files.
+    """
+    compile_source(WARM_UP)
+
+def compile_file(path, cwd=None):
+    """
+    `(errors, status)` of compiling the file at `path`, relative to `cwd` if
+    given, with the errors that CoolCompiler.py reports and its exit status.
+    """
+    try:
+        with open(os.path.join(cwd or '', path), 'r') as fd:
+            text = fd.read()
+    except FileNotFoundError:
+        return [ CompilerError((0, 0), 'El archivo ' + path + ' no se pudo encontrar.') ], 1
+
+    return compile_text(text)
+
+def compile_text(text):
+    """
+    `(errors, status)` of compiling the COOL program `text`, see `compile_source`.
+    """
+    compilation = compile_source(text)
+    return compilation.errors, compilation.status
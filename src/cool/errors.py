@@ -9,6 +9,14 @@ class COOLError:
 
     __repr__ = __str__
 
+    @classmethod
+    def at(cls, source, offset, body):
+        """
+        The error at `offset` of a `SourceMap`, for the subclasses
+        that only take `(pos, body)`.
+        """
+        return cls(source.position(offset), body)
+
 class CompilerError(COOLError):
     def __init__(self, pos, body):
         super().__init__('CompilerError', pos, body)
@@ -1,8 +1,8 @@
 from .cmp import visitor
-from .parser import ProgramNode, ClassDeclarationNode, AttrDeclarationNode, FuncDeclarationNode
-from .parser import IfThenElseNode, WhileLoopNode, BlockNode, LetInNode, CaseOfNode
-from .parser import AssignNode, UnaryNode, BinaryNode
-from .parser import FunctionCallNode, MemberCallNode, NewNode, AtomicNode
+from .nodes import ProgramNode, ClassDeclarationNode, AttrDeclarationNode, FuncDeclarationNode
+from .nodes import IfThenElseNode, WhileLoopNode, BlockNode, LetInNode, CaseOfNode
+from .nodes import AssignNode, UnaryNode, BinaryNode
+from .nodes import FunctionCallNode, MemberCallNode, NewNode, AtomicNode
 
 class FormatVisitor:
     @visitor.on('node')
@@ -1,236 +1,218 @@
-import ply.lex as lex
+import re
+from functools import partial
+from .cmp import Lexer, Token, once
 from .errors import LexicographicError
-
-def find_column(code, token):
-    line_start = code.rfind('\n', 0, token.lexpos) + 1
-    return token.lexpos - line_start + 1
-
-###### TOKEN LISTS ######
-reserved = [
-	'CLASS',
-	'INHERITS',
-	'IF',
-	'THEN',
-	'ELSE',
-	'FI',
-	'WHILE',
-	'LOOP',
-	'POOL',
-	'LET',
-	'IN',
-	'CASE',
-	'OF',
-	'ESAC',
-	'NEW',
-	'ISVOID',
-]
-
-tokens = [
-    # Literals
-    'LIT',
-	# Identifiers
-	'TYPE', 'ID',
-	# Primitive data types
-	'INTEGER', 'STRING', 'BOOL',
-	# Special keywords
-	'ACTION',
-	# Operators
-	'ASSIGN', 'LESS', 'LESSEQUAL', 'EQUAL', 'INT_COMPLEMENT', 'NOT',
-] + reserved
-
-# Ignore rule for single line comments
-# t_ignore_SINGLE_LINE_COMMENT = r"\-\-[^\n]*"
-def t_SINGLE_LINE_COMMENT(token):
-    r"\-\-[^\n]*"
-    token.lexer.lineno += 1
-    token.lexer.skip(1)
+from .source import SourceMap
 
 ###### TOKEN RULES ######
+# the tags of the operators are their terminals
+OPERATORS = [
+    ('assign', r'<-'),
+    ('lessequal', r'<='),
+    ('less', r'<'),
+    ('action', r'=>'),
+    ('equal', r'='),
+    ('int_complement', r'~'),
+] + [ (char, '\\' + char) for char in '+-*/:;(){}@.,' ]
+
+# `(tag, pattern)`, the longest match wins and the first rule a tie
+RULES = [
+    ('whitespace', r'[ \t\r\f\n]+'),
+    ('line_comment', r'--'),
+    ('comment', r'\(\*'),
+    ('string', r'"'),
+    ('integer', r'[0-9]+'),
+    ('type', r'[A-Z][A-Za-z0-9_]*'),
+    ('id', r'[a-z][A-Za-z0-9_]*'),
+] + OPERATORS + [
+    # characters that no token starts with, a run of them is a single error
+    ('invalid', r'[^A-Za-z0-9+\-*/:;(){}@.,<=~" \t\r\f\n]+'),
+]
 
-# Operators
-t_LIT = r"[\+\-\*\/\:\;\(\)\{\}\@\.\,]"
-t_ASSIGN = r'<-'
-t_LESS = r'<'
-t_LESSEQUAL = r'<='
-t_EQUAL = r'='
-t_INT_COMPLEMENT = r'~'
-
-# Special keywords
-t_ACTION = r'=>'
-
-# Primitive data types
-def t_INTEGER(t):
-	r"[0-9]+"
-	t.value = int(t.value)
-	return t
-
-def t_BOOL(t):
-	r"t[rR][uU][eE]|f[aA][lL][sS][eE]"
-	t.value = True if t.value.lower() == 'true' else False
-	return t
-
-
-
-# Other tokens with precedence before TYPE and ID
-def t_NOT(t):
-	r"[nN][oO][tT]"
-	return t
-
-# Identifiers
-def check_RESERVED(t):
-    tupper = t.value.upper()
-
-    if tupper in reserved:
-        t.type = tupper
-
-def t_TYPE(t):
-    r"[A-Z][A-Za-z0-9_]*"
-    check_RESERVED(t)
-    return t
-
-def t_ID(t):
-    r"[a-z][A-Za-z0-9_]*"
-    check_RESERVED(t)
-    return t
-
-def t_newline(token):
-    r"\n+"
-    token.lexer.lineno += len(token.value)
-
-t_ignore = ' \t\r\f'
-
-# LEXER STATES
-states = (
-        ("STRING", "exclusive"),
-        ("COMMENT", "exclusive")
-    )
-###
-
-# THE STRING STATE
-def t_start_string(token):
-    r"\""
-    token.lexer.push_state("STRING")
-    token.lexer.string_backslashed = False
-    token.lexer.stringbuf = ""
-
-def t_STRING_newline(token):
-    r"\n"
-    token.lexer.lineno += 1
-    if not token.lexer.string_backslashed:
-        errors.append(LexicographicError((token.lineno, find_column(token.lexer.lexdata, token)), 'Unterminated string constant'))
-        token.lexer.pop_state()
-    else:
-        token.lexer.string_backslashed = False
-
-def t_STRING_null(token):
-    r"\0"
-    errors.append(LexicographicError((token.lineno, find_column(token.lexer.lexdata, token)), 'Null character in string'))
-    token.lexer.skip(1)
-
-def t_STRING_end(token):
-    r"\""
-    if not token.lexer.string_backslashed:
-        token.lexer.pop_state()
-        token.value = token.lexer.stringbuf
-        token.type = "STRING"
-        return token
-    else:
-        token.lexer.stringbuf += '"'
-        token.lexer.string_backslashed = False
-
-def t_STRING_anything(token):
-    r"[^\n]"
-    if token.lexer.string_backslashed:
-        if token.value == 'b':
-            token.lexer.stringbuf += '\b'
-        elif token.value == 't':
-            token.lexer.stringbuf += '\t'
-        elif token.value == 'n':
-            token.lexer.stringbuf += '\n'
-        elif token.value == 'f':
-            token.lexer.stringbuf += '\f'
-        elif token.value == '\\':
-            token.lexer.stringbuf += '\\'
-        else:
-            token.lexer.stringbuf += token.value
-        token.lexer.string_backslashed = False
-    else:
-        if token.value != '\\':
-            token.lexer.stringbuf += token.value
-        else:
-            token.lexer.string_backslashed = True
-
-# STRING ignored characters
-t_STRING_ignore = ''
-
-# STRING error handler
-def t_STRING_error(token):
-    errors.append(LexicographicError((token.lineno, find_column(token.lexer.lexdata, token)), 'ERROR at or near ' + token.value[:10]))
-    token.lexer.skip(1)
-
-def t_STRING_eof(token):
-    errors.append(LexicographicError((token.lineno, find_column(token.lexer.lexdata, token)), 'EOF in string'))
-    token.lexer.pop_state()
-
-###
-# THE COMMENT STATE
-def t_start_comment(token):
-    r"\(\*"
-    token.lexer.push_state("COMMENT")
-    token.lexer.comment_count = 0
-
-def t_COMMENT_newline(token):
-    r"\n+"
-    token.lexer.lineno += len(token.value)
-
-
-def t_COMMENT_startanother(t):
-    r"\(\*"
-    t.lexer.comment_count += 1
-
-def t_COMMENT_end(token):
-    r"\*\)"
-    if token.lexer.comment_count == 0:
-        token.lexer.pop_state()
-    else:
-        token.lexer.comment_count -= 1
-
-# COMMENT ignored characters
-t_COMMENT_ignore = ''
-
-# COMMENT error handler
-def t_COMMENT_error(token):
-    token.lexer.skip(1)
-
-def t_COMMENT_eof(token):
-    errors.append(LexicographicError((token.lineno, find_column(token.lexer.lexdata, token)), 'EOF in comment'))
-    token.lexer.pop_state()
-
-###### SPECIAL RULES ######
-errors = []
-
-def t_error(token):
-    errors.append(LexicographicError((token.lineno, find_column(token.lexer.lexdata, token)), 'ERROR at ooooor near ' + token.value[:10]))
-    token.lexer.skip(1)
-
-
-###### CREATE LEXER ######
-lex.lex()
+OPERATOR_TAGS = { tag for tag, _ in OPERATORS }
+
+# `(terminal, lex)` of the keywords, which are case insensitive, but for
+# `true` and `false`, that are only booleans starting in lowercase
+KEYWORDS = { keyword: (keyword, None) for keyword in (
+    'class', 'inherits', 'if', 'then', 'else', 'fi', 'while', 'loop', 'pool',
+    'let', 'in', 'case', 'of', 'esac', 'new', 'isvoid', 'not',
+) }
+ID_KEYWORDS = dict(KEYWORDS, true=('bool', True), false=('bool', False))
+
+@once
+def rules_lexer():
+    """
+    The `Lexer` of `RULES`, built on first use and only read after.
+    """
+    return Lexer(RULES)
+
+# strings and comments are scanned by runs
+STRING_RUN = re.compile(r'[^"\\\n\0]+')
+STRING_ESCAPES_RUN = re.compile(r'(?:\\[^\n\0])+')
+STRING_ESCAPES = {'b': '\b', 't': '\t', 'n': '\n', 'f': '\f'}
+COMMENT_DELIMITER = re.compile(r'\(\*|\*\)')
+
+class CoolLexer:
+    """
+    Scans COOL sources into `cmp.Token`s of the grammar terminals, with
+    `(line, column)` positions. Every `tokenize` starts from scratch, and
+    stops early at `max_errors` lexical errors, if given.
+
+    Every scan has its own errors and `SourceMap`, and `rules_lexer()` is
+    only read, so a stream is not disturbed by a later `tokenize`, and
+    several lexers can scan at once, from several threads too.
+    """
+    def __init__(self, max_errors=None):
+        self.max_errors = max_errors
+        self.reset()
+
+    def reset(self):
+        self.errors = []
+        self.source = None
+
+    def tokenize(self, code, stream=False):
+        """
+        Lexical errors and tokens of `code`. With `stream` the tokens are
+        scanned as they are consumed, and the errors fill up along the way.
+        """
+        self.reset()
+        self.source = SourceMap(code)
+        tokens = self._scan(code, self.errors, self.source)
+        return self.errors, (tokens if stream else list(tokens))
+
+    def _report(self, errors, source, offset, message):
+        """
+        Adds the lexical error at `offset` of `source` to `errors`. True once
+        they reach `max_errors`, then the rest of the input is dropped.
+        """
+        errors.append(LexicographicError.at(source, offset, message))
+        return self.max_errors is not None and len(errors) >= self.max_errors
+
+    def _scan(self, code, errors, source):
+        report = partial(self._report, errors, source)
+        lexer = rules_lexer()
+        transitions, accepts = lexer.transitions, lexer.accepts
+        codes = lexer.encode(code)
+        pos, length = 0, len(code)
+        # tokens come in order, so the line of each one is found walking the line starts
+        line_starts = source.line_starts + [length + 1]
+        line = 0
+
+        while pos < length:
+            # the longest match at `pos`, see `Lexer.match`
+            tag, end = None, pos + 1
+            cursor, row = pos, transitions[codes[pos]]
+            while row >= 0:
+                cursor += 1
+                if accepts[row] is not None:
+                    tag, end = accepts[row], cursor
+                row = transitions[row + codes[cursor]]
+
+            if tag == 'whitespace':
+                pos = end
+                continue
+
+            while line_starts[line + 1] <= pos:
+                line += 1
+            column = pos - line_starts[line] + 1
+
+            if tag in OPERATOR_TAGS:
+                yield Token(code[pos:end], tag, line + 1, column)
+            elif tag == 'id' or tag == 'type':
+                lex = code[pos:end]
+                keyword = (ID_KEYWORDS if tag == 'id' else KEYWORDS).get(lex.lower())
+                if keyword is None:
+                    yield Token(lex, tag, line + 1, column)
+                else:
+                    terminal, value = keyword
+                    yield Token(lex if value is None else value, terminal, line + 1, column)
+            elif tag == 'integer':
+                yield Token(int(code[pos:end]), tag, line + 1, column)
+            elif tag == 'line_comment':
+                end = code.find('\n', end)
+                end = length if end < 0 else end
+            elif tag == 'comment':
+                end, stop = self._scan_comment(code, end, report)
+                if stop:
+                    return
+            elif tag == 'string':
+                end, token, stop = self._scan_string(code, end, source, report)
+                if token is not None:
+                    yield token
+                if stop:
+                    return
+            elif report(pos, 'ERROR at ooooor near ' + code[pos:pos + 10]):
+                return
+
+            pos = end
+
+    def _scan_comment(self, code, pos, report):
+        # `(end, stop)` of the comment, maybe nested, open before `pos`
+        depth = 0
+        while True:
+            delimiter = COMMENT_DELIMITER.search(code, pos)
+            if delimiter is None:
+                return len(code), report(len(code), 'EOF in comment')
+
+            pos = delimiter.end()
+            if delimiter.group() == '(*':
+                depth += 1
+            elif depth == 0:
+                return pos, False
+            else:
+                depth -= 1
+
+    def _scan_string(self, code, pos, source, report):
+        # `(end, token, stop)` of the string open before `pos`, a lone
+        # backslash is one before a newline, a null character or the end
+        chunks = []
+        backslashed = False
+        length = len(code)
+
+        while pos < length:
+            char = code[pos]
+
+            if char == '\n':
+                if not backslashed:
+                    return pos + 1, None, report(pos, 'Unterminated string constant')
+                backslashed = False
+                pos += 1
+            elif char == '\0':
+                if report(pos, 'Null character in string'):
+                    return pos + 1, None, True
+                # the character after a null is dropped, and a backslash
+                # before the null escapes the one after it
+                pos += 2
+                if backslashed and pos < length and code[pos] not in '\n\0':
+                    chunks.append(STRING_ESCAPES.get(code[pos], code[pos]))
+                    backslashed = False
+                    pos += 1
+            elif char == '"':
+                if not backslashed:
+                    # the token is at the closing quote
+                    line, column = source.position(pos)
+                    return pos + 1, Token(''.join(chunks), 'string', line, column), False
+                chunks.append('"')
+                backslashed = False
+                pos += 1
+            elif char == '\\':
+                escapes = STRING_ESCAPES_RUN.match(code, pos)
+                if escapes is None:
+                    backslashed = True
+                    pos += 1
+                else:
+                    chunks.append(''.join(STRING_ESCAPES.get(char, char) for char in escapes.group()[1::2]))
+                    pos = escapes.end()
+            else:
+                run = STRING_RUN.match(code, pos)
+                chunks.append(run.group())
+                pos = run.end()
+
+        return pos, None, report(pos, 'EOF in string')
 
 ###### TOKENIZER ######
-def tokenizer(code):
-    lex.input(code)
-
-    token_list = []
-
-    while True:
-        token = lex.token()
-
-        if token is None:
-            break
-
-        token.lexpos = find_column(code, token)
-
-        token_list.append(token)
-    
-    return errors, token_list
\ No newline at end of file
+def tokenizer(code, stream=False, max_errors=None):
+    """
+    `CoolLexer(max_errors).tokenize(code, stream)`, with a fresh lexer every call.
+    """
+    return CoolLexer(max_errors).tokenize(code, stream)
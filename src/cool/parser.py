@@ -1,176 +1,6 @@
-from .cmp import Grammar, LR1Parser
-
-# AST Classes
-class Node:
-    pass
-
-class ProgramNode(Node):
-    def __init__(self, declarations):
-        self.declarations = declarations
-        self.line = declarations[0].line
-        self.column = declarations[0].column
-
-class DeclarationNode(Node):
-    pass
-
-class ClassDeclarationNode(DeclarationNode):
-    def __init__(self, idx, features, parent=None):
-        self.id = idx
-        self.parent = parent
-        self.features = features
-        self.line = idx.line
-        self.column = idx.column
-
-class AttrDeclarationNode(DeclarationNode):
-    def __init__(self, idx, typex, expression=None):
-        self.id = idx
-        self.type = typex
-        self.expression = expression
-        self.line = idx.line
-        self.column = idx.column
-
-class FuncDeclarationNode(DeclarationNode):
-    def __init__(self, idx, params, return_type, body):
-        self.id = idx
-        self.params = params
-        self.type = return_type
-        self.body = body
-        self.line = idx.line
-        self.column = idx.column
-
-class ExpressionNode(Node):
-    pass
-
-class IfThenElseNode(ExpressionNode):
-    def __init__(self, condition, if_body, else_body):
-        self.condition = condition
-        self.if_body = if_body
-        self.else_body = else_body
-        self.line = condition.line
-        self.column = condition.column
-
-class WhileLoopNode(ExpressionNode):
-    def __init__(self, condition, body):
-        self.condition = condition
-        self.body = body
-        self.line = condition.line
-        self.column = condition.column
-        
-
-class BlockNode(ExpressionNode):
-    def __init__(self, expressions):
-        self.expressions = expressions
-        self.line = expressions[-1].line
-        self.column = expressions[-1].column
-
-class LetInNode(ExpressionNode):
-    def __init__(self, let_body, in_body):
-        self.let_body = let_body
-        self.in_body = in_body
-        self.line = in_body.line
-        self.column = in_body.column
-
-class CaseOfNode(ExpressionNode):
-    def __init__(self, expression, branches):
-        self.expression = expression
-        self.branches = branches
-        self.line = expression.line
-        self.column = expression.column
-
-class AssignNode(ExpressionNode):
-    def __init__(self, idx, expression):
-        self.id = idx
-        self.expression = expression
-        self.line = idx.line
-        self.column = idx.column
-
-class UnaryNode(ExpressionNode):
-    def __init__(self, expression):
-        self.expression = expression
-        self.line = expression.line
-        self.column = expression.column
-
-class NotNode(UnaryNode):
-    pass
-
-class BinaryNode(ExpressionNode):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
-        self.line = left.line
-        self.column = left.column
-
-class LessEqualNode(BinaryNode):
-    pass
-
-class LessNode(BinaryNode):
-    pass
-
-class EqualNode(BinaryNode):
-    pass
-
-class ArithmeticNode(BinaryNode):
-    pass
-
-class PlusNode(ArithmeticNode):
-    pass
-
-class MinusNode(ArithmeticNode):
-    pass
-
-class StarNode(ArithmeticNode):
-    pass
-
-class DivNode(ArithmeticNode):
-    pass
-
-class IsVoidNode(UnaryNode):
-    pass
-
-class ComplementNode(UnaryNode):
-    pass
-
-class FunctionCallNode(ExpressionNode):
-    def __init__(self, obj, idx, args, typex=None):
-        self.obj = obj
-        self.id = idx
-        self.args = args
-        self.type = typex
-        self.line = idx.line
-        self.column = idx.column
-
-class MemberCallNode(ExpressionNode):
-    def __init__(self, idx, args):
-        self.id = idx
-        self.args = args
-        self.line = idx.line
-        self.column = idx.column
-
-class NewNode(ExpressionNode):
-    def __init__(self, typex):
-        self.type = typex
-        self.line = typex.line
-        self.column = typex.column
-
-class AtomicNode(ExpressionNode):
-    def __init__(self, token):
-        self.token = token
-        self.line = token.line
-        self.column = token.column
-
-class IntegerNode(AtomicNode):
-    pass
-
-class IdNode(AtomicNode):
-    pass
-
-class StringNode(AtomicNode):
-    pass
-
-class BoolNode(AtomicNode):
-    pass
-
-
+import os
+from .cmp import Grammar, LALR1Parser, append, once
+from .nodes import *
 
 # grammar
 CoolGrammar = Grammar()
@@ -194,12 +24,15 @@ semi, colon, comma, dot, at, opar, cpar, ocur, ccur, larrow, rarrow = CoolGramma
 plus, minus, star, div, isvoid, compl = CoolGrammar.Terminals('+ - * / isvoid int_complement')
 notx, less, leq, equal = CoolGrammar.Terminals('not less lessequal equal')
 new, idx, typex, integer, string, boolx = CoolGrammar.Terminals('new id type integer string bool')
+error = CoolGrammar.Terminal('error')
 
 # productions
+# lists are left recursive and grow in place with `append`, so they are built
+# in linear time and do not pile up on the parsing stack
 program %= class_list, lambda h, s: ProgramNode(s[1])
 
 # <class-list>   ???
-class_list %= def_class + class_list, lambda h, s: [s[1]] + s[2]
+class_list %= class_list + def_class, lambda h, s: append(s[1], s[2])
 class_list %= def_class, lambda h, s: [s[1]]
 
 # <def-class>    ???
@@ -207,7 +40,7 @@ def_class %= classx + typex + ocur + feature_list + ccur + semi, lambda h, s: Cl
 def_class %= classx + typex + inherits + typex + ocur + feature_list + ccur + semi, lambda h, s: ClassDeclarationNode(s[2], s[6], s[4])
 
 # <feature-list> ???
-feature_list %= feature + feature_list, lambda h, s: [s[1]] + s[2]
+feature_list %= feature_list + feature, lambda h, s: append(s[1], s[2])
 feature_list %= CoolGrammar.Epsilon, lambda h, s: []
 
 # <def-attr>     ???
@@ -220,24 +53,24 @@ feature %= idx + opar + cpar + colon + typex + ocur + expr + ccur + semi, lambda
 
 # <param-list>   ???
 param_list %= param, lambda h, s: [s[1]]
-param_list %= param + comma + param_list, lambda h, s: [s[1]] + s[3]
+param_list %= param_list + comma + param, lambda h, s: append(s[1], s[3])
 
 # <param>        ???
 param %= idx + colon + typex, lambda h, s: (s[1], s[3])
 
 # <expr-list>    ???
 expr_list %= expr + semi, lambda h, s: [s[1]]
-expr_list %= expr + semi + expr_list, lambda h, s: [s[1]] + s[3]
+expr_list %= expr_list + expr + semi, lambda h, s: append(s[1], s[2])
 
 # <let-list>     ???
 let_list %= idx + colon + typex, lambda h, s: [(s[1], s[3], None)]
 let_list %= idx + colon + typex + larrow + expr, lambda h, s: [(s[1], s[3], s[5])]
-let_list %= idx + colon + typex + comma + let_list, lambda h, s: [(s[1], s[3], None)] + s[5]
-let_list %= idx + colon + typex + larrow + expr + comma + let_list, lambda h, s: [(s[1], s[3], s[5])] + s[7]
+let_list %= let_list + comma + idx + colon + typex, lambda h, s: append(s[1], (s[3], s[5], None))
+let_list %= let_list + comma + idx + colon + typex + larrow + expr, lambda h, s: append(s[1], (s[3], s[5], s[7]))
 
 # <case-list>    ???
 case_list %= idx + colon + typex + rarrow + expr + semi, lambda h, s: [(s[1], s[3], s[5])]
-case_list %= idx + colon + typex + rarrow + expr + semi + case_list, lambda h, s: [(s[1], s[3], s[5])] + s[7]
+case_list %= case_list + idx + colon + typex + rarrow + expr + semi, lambda h, s: append(s[1], (s[2], s[4], s[6]))
 
 # <truth-expr>   ???
 # expr %= notx + expr, lambda h, s: NotNode(s[2])
@@ -294,16 +127,60 @@ func_call %= at + typex + dot + idx + opar + cpar, lambda h, s: (s[4], [], s[2])
 
 # <arg-list>    ???
 arg_list %= expr, lambda h, s: [s[1]]
-arg_list %= expr + comma + arg_list, lambda h, s: [s[1]] + s[3]
+arg_list %= arg_list + comma + expr, lambda h, s: append(s[1], s[3])
 
 # <member-call> ???
 member_call %= idx + opar + arg_list + cpar, lambda h, s: MemberCallNode(s[1], s[3])
 member_call %= idx + opar + cpar, lambda h, s: MemberCallNode(s[1], [])
 
+# <error>        ???
+# panic mode recovery syncs on `;`, `}`, `fi`, `pool` and `esac`, see `lr_parse`
+def_class %= error + semi, lambda h, s: None
+feature %= error + semi, lambda h, s: None
+expr_list %= error + semi, lambda h, s: None
+expr_list %= expr_list + error + semi, lambda h, s: None
+case_list %= error + semi, lambda h, s: None
+case_list %= case_list + error + semi, lambda h, s: None
+atom %= ocur + error + ccur, lambda h, s: None
+atom %= ocur + expr_list + error + ccur, lambda h, s: None
+atom %= ifx + error + fi, lambda h, s: None
+atom %= whilex + error + pool, lambda h, s: None
+atom %= case + error + esac, lambda h, s: None
+
 # parser
-CoolParser = LR1Parser(CoolGrammar)
+# the parsing tables are cached in `src/build`, `make clean` drops them
+TABLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'build')
+
+@once
+def cool_parser():
+    """
+    CoolParser, built (or loaded from the cache) on first use.
+    """
+    return LALR1Parser(CoolGrammar, cache_dir=TABLES_DIR)
+
+def __getattr__(name):
+    if name == 'CoolParser':
+        return cool_parser()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def parse(tokens, errors=None):
+    """
+    Parses `tokens` with CoolParser.
+    Returns `(ast, None)`, or `(None, token)` at the first unexpected token.
+    Given an `errors` list, collects every unexpected token in it.
+    """
+    return cool_parser().parse(tokens, errors)
+
+# standalone parser generated by `make`, see `cool.load_parser`
+PARSETAB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parsetab.py')
+PARSETAB_SOURCES = ('parser.py', 'cmp/grammar.py', 'cmp/grammartools.py', 'cmp/parsergen.py')
 
 if __name__ == '__main__':
-    if CoolParser.is_lr1:
-        print('The grammar is LR1')
-        print(CoolGrammar)
\ No newline at end of file
+    from .cmp.parsergen import write_parser_module
+
+    CoolParser = cool_parser()
+    if CoolParser.is_lalr1:
+        print('The grammar is LALR1')
+        print(CoolGrammar)
+
+    write_parser_module(CoolParser, PARSETAB, PARSETAB_SOURCES)
@@ -0,0 +1,118 @@
+"""
+Compile server: a long running process that keeps the lexer, the parser and
+the visitors loaded and compiles the files it is asked for over a Unix socket,
+so a `coolc.sh` run only pays for the compile work (see CoolClient.py).
+
+    $ cd src
+    $ python -m cool.server [--socket build/coolc.sock] [--jobs 4]
+
+A request is a JSON line `{"path": ..., "cwd": ...}` and its response a JSON
+line `{"stdout": ..., "stderr": ..., "status": ...}` with what CoolCompiler.py
+would have written and its exit status. A connection may send several
+requests, they are answered in order.
+"""
+import asyncio
+import json
+import os
+import signal
+import socket
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from .compiler import compile_file, warm_up
+
+# the socket lives next to the parsing tables, `make clean` drops it
+SOCKET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'build', 'coolc.sock')
+
+def compile_request(request):
+    """
+    Response to a request, see the module docstring.
+    """
+    try:
+        errors, status = compile_file(request['path'], request.get('cwd'))
+    except Exception:
+        return { 'stdout': '', 'stderr': traceback.format_exc(), 'status': 1 }
+    return { 'stdout': ''.join(str(error) + '\n' for error in errors), 'stderr': '', 'status': status }
+
+class CompileServer:
+    """
+    Answers the requests of every connection on an asyncio loop, and compiles
+    on a pool of `jobs` threads, at most `jobs` files at once. The rest of the
+    requests wait their turn on the loop.
+    """
+    def __init__(self, path=SOCKET, jobs=4):
+        self.path = path
+        self.jobs = jobs
+        self.executor = ThreadPoolExecutor(jobs, thread_name_prefix='coolc')
+        self.slots = None
+        self.server = None
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        self.slots = asyncio.Semaphore(self.jobs)
+
+        warm_up()
+        remove_stale_socket(self.path)
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.server = await asyncio.start_unix_server(self.handle, self.path)
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self.server.close)
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.executor.shutdown()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    async def handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = { 'stdout': '', 'stderr': 'Bad request\n', 'status': 2 }
+                else:
+                    async with self.slots:
+                        response = await loop.run_in_executor(self.executor, compile_request, request)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+def remove_stale_socket(path):
+    """
+    Removes the socket at `path` if no server listens on it, e.g. after a
+    crash. Raises `OSError` if one does.
+    """
+    if not os.path.exists(path):
+        return
+
+    with socket.socket(socket.AF_UNIX) as client:
+        try:
+            client.connect(path)
+        except OSError:
+            os.unlink(path)
+            return
+    raise OSError(f'A compile server already listens on {path}')
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='python -m cool.server', description='COOL compile server')
+    parser.add_argument('--socket', default=os.environ.get('COOLC_SOCKET', SOCKET), help='path of the Unix socket')
+    parser.add_argument('--jobs', type=int, default=4, help='files compiled at once')
+    args = parser.parse_args(argv)
+
+    asyncio.run(CompileServer(args.socket, args.jobs).serve())
+
+if __name__ == '__main__':
+    main()
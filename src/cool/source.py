@@ -0,0 +1,15 @@
+import re
+from bisect import bisect_right
+
+class SourceMap:
+    """
+    Offsets to `(line, column)` positions of a source, both from 1.
+    The line starts are found once, every position is a `bisect` on them.
+    """
+    def __init__(self, code):
+        self.line_starts = [0]
+        self.line_starts.extend(match.end() for match in re.finditer('\n', code))
+
+    def position(self, offset):
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1] + 1
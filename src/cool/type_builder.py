@@ -1,12 +1,12 @@
 from .errors import SemanticError, TypexError
 from .cmp import visitor, ErrorType, SemanticErrorException
-from .parser import ProgramNode, ClassDeclarationNode, AttrDeclarationNode, FuncDeclarationNode
+from .nodes import ProgramNode, ClassDeclarationNode, AttrDeclarationNode, FuncDeclarationNode
 
 class TypeBuilder:
-    def __init__(self, context, errors=[]):
+    def __init__(self, context, errors=None):
         self.context = context
         self.current_type = None
-        self.errors = errors
+        self.errors = [] if errors is None else errors
 
         # Building built-in types
         self.object_type = self.context.get_type('Object')
@@ -1,10 +1,10 @@
 from .errors import SemanticError, TypexError, NamexError, AttributexError
 from .cmp import visitor, ErrorType, SemanticErrorException, Scope
-from .parser import ProgramNode, ClassDeclarationNode, AttrDeclarationNode, FuncDeclarationNode
-from .parser import IfThenElseNode, WhileLoopNode, BlockNode, LetInNode, CaseOfNode
-from .parser import AssignNode, UnaryNode, BinaryNode, LessEqualNode, LessNode, EqualNode, ArithmeticNode
-from .parser import NotNode, IsVoidNode, ComplementNode, FunctionCallNode, MemberCallNode, NewNode, AtomicNode
-from .parser import IntegerNode, IdNode, StringNode, BoolNode
+from .nodes import ProgramNode, ClassDeclarationNode, AttrDeclarationNode, FuncDeclarationNode
+from .nodes import IfThenElseNode, WhileLoopNode, BlockNode, LetInNode, CaseOfNode
+from .nodes import AssignNode, UnaryNode, BinaryNode, LessEqualNode, LessNode, EqualNode, ArithmeticNode
+from .nodes import NotNode, IsVoidNode, ComplementNode, FunctionCallNode, MemberCallNode, NewNode, AtomicNode
+from .nodes import IntegerNode, IdNode, StringNode, BoolNode
 
 
 WRONG_SIGNATURE = 'El metodo "%s" de "%s" esta definido en "%s" con una signatura diferente.'
@@ -16,11 +16,11 @@ INVALID_OPERATION = 'La operacion no esta definida entre "%s" y "%s".'
 CYCLIC_HERITAGE = 'El typo "%s" forma una cadena ciclica de herencia.'
 
 class TypeChecker:
-    def __init__(self, context, errors=[]):
+    def __init__(self, context, errors=None):
         self.context = context
         self.current_type = None
         self.current_method = None
-        self.errors = errors
+        self.errors = [] if errors is None else errors
 
         # search built-in types
         self.object_type = self.context.get_type('Object')
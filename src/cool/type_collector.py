@@ -1,11 +1,11 @@
 from .errors import SemanticError
 from .cmp import visitor, Context, SemanticErrorException
-from .parser import ProgramNode, ClassDeclarationNode
+from .nodes import ProgramNode, ClassDeclarationNode
 
 class TypeCollector(object):
-    def __init__(self, errors=[]):
+    def __init__(self, errors=None):
         self.context = Context()
-        self.errors = errors
+        self.errors = [] if errors is None else errors
 
         # Creating built-in types
         self.context.create_type('Object')
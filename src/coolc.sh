@@ -8,5 +8,12 @@ echo "LINEA_CON_NOMBRE_Y_VERSION_DEL_COMPILADOR"        # TODO: Recuerde cambiar
 echo "Copyright (c) 2019: Nombre1, Nombre2, Nombre3"    # TODO: líneas a los valores correctos
 
 # Llamar al compilador
-python CoolCompiler.py $INPUT_FILE
+# con un servidor de compilación escuchando (`make server`) se le pide a él,
+# con la misma salida y el mismo código de salida
+COOLC_SOCKET=${COOLC_SOCKET:-build/coolc.sock}
+if [ -S "$COOLC_SOCKET" ]; then
+    python CoolClient.py $INPUT_FILE "$COOLC_SOCKET"
+else
+    python CoolCompiler.py $INPUT_FILE
+fi
 # Todo: Semantic
@@ -0,0 +1,121 @@
+import pytest
+import random
+import re
+from itertools import product
+
+from cool.cmp import Lexer, State, regex_automaton
+
+ALPHABET = 'abc'
+WORDS = [''.join(word) for n in range(6) for word in product(ALPHABET, repeat=n)]
+
+def random_regex(rand, depth=4):
+    if depth == 0 or rand.random() < 0.25:
+        return rand.choice(ALPHABET + '.') if rand.random() < 0.8 else '[%s]' % ''.join(rand.sample(ALPHABET, 2))
+    op = rand.choice('|+*?()')
+    if op == '|':
+        return random_regex(rand, depth - 1) + '|' + random_regex(rand, depth - 1)
+    if op == '+':
+        return random_regex(rand, depth - 1) + random_regex(rand, depth - 1)
+    if op == '(' or op == ')':
+        return '(' + random_regex(rand, depth - 1) + ')'
+    return '(' + random_regex(rand, depth - 1) + ')' + op
+
+def dfa(pattern):
+    start, final = regex_automaton(pattern)
+    final.final = True
+    return start.to_deterministic()
+
+def language(start):
+    # the words of WORDS that the DFA from `start` accepts
+    states, symbols, transitions = start.to_arrays()
+    columns = {symbol: j for j, symbol in enumerate(symbols)}
+    accepted = set()
+    for word in WORDS:
+        i = 0
+        for char in word:
+            i = transitions[i * len(symbols) + columns[char]] if char in columns else -1
+            if i < 0:
+                break
+        else:
+            if states[i].final:
+                accepted.add(word)
+    return accepted
+
+def moore_size(start):
+    # states of the minimal DFA by Moore's refinement, over the DFA made complete with a dead state
+    states, symbols, transitions = start.to_arrays()
+    width, dead = len(symbols), len(states)
+    moves = [[dead if target < 0 else target for target in transitions[i * width:(i + 1) * width]] for i in range(dead)]
+    moves.append([dead] * width)
+    block_of = [int(state.final) for state in states] + [0]
+    count = len(set(block_of))
+    while True:
+        signatures = {}
+        block_of = [signatures.setdefault((block_of[i],) + tuple(block_of[t] for t in moves[i]), len(signatures)) for i in range(dead + 1)]
+        if len(signatures) == count:
+            # the states that reach no final one are in the block of the dead
+            # state, which is left out, but for the start state if it is there
+            return max(count - 1, 1) if block_of[0] == block_of[dead] else count - 1
+        count = len(signatures)
+
+@pytest.mark.automata
+def test_regex_matches_re():
+    rand = random.Random(2020)
+    for _ in range(200):
+        pattern = random_regex(rand)
+        assert language(dfa(pattern)) == {word for word in WORDS if re.fullmatch(pattern, word)}, pattern
+
+@pytest.mark.automata
+@pytest.mark.parametrize("pattern", [
+    'a*b|ab*', '(a|b)*abb', '',
+    # some random ones that Hopcroft got wrong splitting the splitter itself
+    'b(b|(cc|cc))bc|cc(((a|b))*)?(b)?',
+    '(b|(((cb)*)?|((b|aa)|b(b)*)))((((c|b))*(a)*cc|(a)*(a|a)(a|(c)*))|(((a|c))?)*b)',
+    '(((ac)?)?(((c|c))*)?|a((b)*|(a)?)ab(a)?((a|c))*)',
+])
+def test_minimize_known(pattern):
+    start = dfa(pattern)
+    minimal = start.minimize()
+    assert language(minimal) == language(start)
+    assert len(list(minimal)) == moore_size(start)
+
+@pytest.mark.automata
+def test_minimize_random():
+    rand = random.Random(21)
+    for _ in range(1000):
+        pattern = random_regex(rand)
+        start = dfa(pattern)
+        minimal = start.minimize()
+        assert language(minimal) == language(start), pattern
+        assert len(list(minimal)) == moore_size(start), pattern
+
+def automaton(edges, finals):
+    # DFA from the state 0 with the `(origin, symbol, target)` edges
+    states = {}
+    def state(n):
+        return states.setdefault(n, State(n, n in finals))
+    start = state(0)
+    for origin, symbol, target in edges:
+        state(origin).add_transition(symbol, state(target))
+    return start
+
+@pytest.mark.automata
+@pytest.mark.parametrize("edges, finals, size", [
+    ([(0, 'a', 1), (1, 'a', 3), (0, 'b', 2)], {2}, 2),
+    ([(0, 'a', 1), (1, 'b', 1), (1, 'a', 2), (0, 'b', 3), (3, 'a', 4), (4, 'a', 4)], {2, 3}, 3),
+    ([(0, 'a', 1), (1, 'a', 0)], set(), 1),
+])
+def test_minimize_dead_ends(edges, finals, size):
+    start = automaton(edges, finals)
+    minimal = start.minimize()
+    assert language(minimal) == language(start)
+    assert len(list(minimal)) == size == moore_size(start)
+
+@pytest.mark.automata
+def test_lexer_longest_match_first_rule():
+    lexer = Lexer([('if', 'if'), ('id', '[a-z]+'), ('num', '[0-9]+'), ('space', ' +')])
+    codes = lexer.encode('if iffy 42 ?')
+    assert lexer.match(codes, 0) == ('if', 2)
+    assert lexer.match(codes, 3) == ('id', 7)
+    assert lexer.match(codes, 8) == ('num', 10)
+    assert lexer.match(codes, 11) == (None, 11)
@@ -0,0 +1,48 @@
+import pytest
+import json
+import subprocess
+import sys
+from utils import first_error
+
+tests_root = __file__.rpartition('/')[0]
+
+@pytest.mark.batch
+@pytest.mark.parametrize("folder", ['lexer', 'parser'])
+def test_batch(folder):
+    sp = subprocess.run([sys.executable, '-m', 'cool.batch', '--jobs', '2', tests_root + '/' + folder], capture_output=True)
+    results = [json.loads(line) for line in sp.stdout.decode().splitlines()]
+
+    assert [result['path'] for result in results] == sorted(result['path'] for result in results)
+    assert sp.returncode == (1 if results else 0)
+    for result in results:
+        fd = open(result['path'][:-3] + '_error.txt', 'r')
+        errors = fd.read().split('\n')
+        fd.close()
+
+        assert result['status'] == 1
+        output = '\n'.join('(%d, %d) - %s: %s' % (error['line'], error['column'], error['type'], error['message']) for error in result['errors'])
+        first_error(output.split('\n'), errors)
+
+@pytest.mark.batch
+def test_batch_order():
+    paths = [tests_root + '/codegen/arith.cl', tests_root + '/missing.cl', tests_root + '/lexer/iis1.cl']
+    sp = subprocess.run([sys.executable, '-m', 'cool.batch', '--jobs', '2'] + paths, capture_output=True)
+    results = [json.loads(line) for line in sp.stdout.decode().splitlines()]
+
+    assert sp.returncode == 1
+    assert [result['path'] for result in results] == paths
+    assert [result['status'] for result in results] == [0, 1, 1]
+    assert results[1]['errors'][0]['type'] == 'CompilerError'
+
+@pytest.mark.batch
+def test_batch_undecodable(tmp_path):
+    latin1 = tmp_path / 'latin1.cl'
+    latin1.write_bytes('class Main { s : String <- "año"; };'.encode('latin-1'))
+    paths = [str(latin1), tests_root + '/codegen/arith.cl']
+    sp = subprocess.run([sys.executable, '-m', 'cool.batch', '--jobs', '2'] + paths, capture_output=True)
+    results = [json.loads(line) for line in sp.stdout.decode().splitlines()]
+
+    assert sp.returncode == 1
+    assert [result['path'] for result in results] == paths
+    assert [result['status'] for result in results] == [1, 0]
+    assert results[0]['errors'][0]['type'] == 'CompilerError'
@@ -0,0 +1,61 @@
+import pytest
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+tests_root = __file__.rpartition('/')[0]
+from cool import compile_source, ProgramNode
+
+def read(path):
+    fd = open(tests_root + '/' + path, 'r')
+    text = fd.read()
+    fd.close()
+    return text
+
+@pytest.mark.compiler
+def test_compile_source():
+    compilation = compile_source(read('codegen/arith.cl'))
+    assert compilation.phase == 'semantic' and compilation.status == 0 and compilation.errors == []
+    assert isinstance(compilation.ast, ProgramNode)
+    assert compilation.context.get_type('Main').name == 'Main'
+
+@pytest.mark.compiler
+def test_compile_source_stop_after():
+    text = read('codegen/arith.cl')
+    lexed = compile_source(text, stop_after='lexer')
+    assert lexed.phase == 'lexer' and lexed.tokens and lexed.ast is None
+
+    parsed = compile_source(text, stop_after='parser')
+    assert parsed.phase == 'parser' and isinstance(parsed.ast, ProgramNode) and parsed.context is None
+
+    with pytest.raises(ValueError):
+        compile_source(text, stop_after='codegen')
+
+@pytest.mark.compiler
+@pytest.mark.parametrize("path, phase, error", [
+    ('lexer/iis1.cl', 'lexer', 'LexicographicError'),
+    ('parser/assignment1.cl', 'parser', 'SyntacticError'),
+    ('codegen/graph.cl', 'semantic', 'TypeError'),
+])
+def test_compile_source_errors(path, phase, error):
+    compilation = compile_source(read(path))
+    assert compilation.phase == phase and compilation.status == 1
+    assert compilation.errors[0].name == error
+
+@pytest.mark.compiler
+def test_compile_source_reentrant():
+    texts = [read('codegen/' + file) for file in sorted(os.listdir(tests_root + '/codegen')) if file.endswith('.cl')]
+    expected = [[str(error) for error in compile_source(text).errors] for text in texts]
+
+    # the errors of a compile do not leak into the next ones, nor into those of other threads
+    with ThreadPoolExecutor(4) as executor:
+        for _ in range(2):
+            compilations = list(executor.map(compile_source, texts * 2))
+            assert [[str(error) for error in compilation.errors] for compilation in compilations] == expected * 2
+
+@pytest.mark.compiler
+def test_visitors_own_errors():
+    from cool import TypeCollector, TypeBuilder, TypeChecker
+    first, second = TypeCollector(), TypeCollector()
+    assert first.errors is not second.errors
+    assert TypeBuilder(first.context).errors is not TypeBuilder(second.context).errors
+    assert TypeChecker(first.context).errors is not TypeChecker(second.context).errors
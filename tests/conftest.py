@@ -1,5 +1,9 @@
 import pytest
 import os
+import sys
+
+# the tests that use the compiler in process import it from src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
 
 @pytest.fixture
 def compiler_path():
@@ -0,0 +1,96 @@
+import pytest
+import os
+
+from cool.cmp import Grammar, LR1Parser, LALR1Parser, Token
+from cool.parser import CoolGrammar
+
+def core(state):
+    return frozenset((str(item.production), item.pos) for item in state.state)
+
+def merged_states(parser):
+    """
+    `{core: (reduce lookaheads, gotos)}` of the states of the automaton of
+    `parser` merged by their LR(0) cores, the lookaheads of a core are the
+    union of those of its states. Accepting is left out, it is only on EOF.
+    """
+    start = parser.augmentedG.startSymbol
+    merged = {}
+    for state in parser.automaton:
+        lookaheads, gotos = merged.setdefault(core(state), ({}, {}))
+        for item in state.state:
+            if item.IsReduceItem and item.production.Left != start:
+                lookaheads.setdefault((str(item.production), item.pos), set()).update(t.Name for t in item.lookaheads)
+        for symbol, (target,) in state.transitions.items():
+            assert gotos.setdefault(symbol, core(target)) == core(target)
+    return merged
+
+def merged_actions(parser):
+    """
+    `{(core, symbol): actions}` of the action table of `parser` with its
+    states merged by their LR(0) cores, see `merged_states`.
+    """
+    cores = { state.idx: core(state) for state in parser.automaton }
+    merged = {}
+    for state, row in parser.action.items():
+        for symbol, cell in row.items():
+            actions = merged.setdefault((cores[state], symbol.Name), set())
+            actions.update((action, cores[tag] if action == 'SHIFT' else str(tag)) for action, tag in cell)
+    return merged
+
+@pytest.mark.parser
+def test_lalr_is_merged_lr1():
+    lalr = LALR1Parser(CoolGrammar)
+    lr1 = LR1Parser(CoolGrammar)
+    states = merged_states(lalr)
+
+    # LALR(1) has a state per core, and merging the LR(1) states by core gives them back
+    assert len(states) == len(list(lalr.automaton)) == len(lalr.action)
+    assert states == merged_states(lr1)
+    # and so are the tables, with the same conflicts (the grammar leaves the
+    # precedence of some operators to shifting first)
+    assert merged_actions(lalr) == merged_actions(lr1)
+    assert lalr.is_lalr1 == lr1.is_lr1
+
+def ambiguous():
+    G = Grammar()
+    E = G.NonTerminal('E', True)
+    plus, num = G.Terminals('+ num')
+    E %= E + plus + E, lambda h, s: (s[1], s[3])
+    E %= num, lambda h, s: s[1].lex
+    return G
+
+@pytest.mark.parser
+def test_lalr_conflicts():
+    parser = LALR1Parser(ambiguous())
+    assert not parser.is_lalr1
+
+    conflicts = parser.conflicts
+    assert [symbol.Name for _, symbol, _ in conflicts] == ['+']
+    # the shift comes first, as in yacc, so + is right associative
+    (_, _, cell), = conflicts
+    assert [action for action, _ in cell] == ['SHIFT', 'REDUCE']
+    tokens = [Token(lex, terminal) for lex, terminal in [('1', 'num'), ('+', '+'), ('2', 'num'), ('+', '+'), ('3', 'num'), ('$', '$')]]
+    assert parser.parse(tokens) == (('1', ('2', '3')), None)
+
+def tables(parser):
+    return ({ state: { symbol.Name: [ (action, str(tag)) for action, tag in cell ] for symbol, cell in row.items() } for state, row in parser.action.items() },
+            { state: { symbol.Name: cell for symbol, cell in row.items() } for state, row in parser.goto.items() })
+
+@pytest.mark.parser
+@pytest.mark.parametrize("G", [ambiguous(), CoolGrammar], ids=['ambiguous', 'cool'])
+def test_lr1_parallel_build(G, monkeypatch):
+    serial = LR1Parser(G)
+
+    # every frontier goes to the pool
+    pooled = []
+    closures = LR1Parser._closures
+    def spy(self, items, kernels, pool):
+        pooled.append(pool is not None)
+        return closures(self, items, kernels, pool)
+    monkeypatch.setattr(LR1Parser, 'PARALLEL_FRONTIER', 1)
+    monkeypatch.setattr(LR1Parser, '_closures', spy)
+    parallel = LR1Parser(G, workers=2)
+
+    assert pooled and all(pooled)
+    assert tables(parallel) == tables(serial)
+    assert parallel.is_lr1 == serial.is_lr1
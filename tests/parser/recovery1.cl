@@ -0,0 +1,24 @@
+(* Every syntactic error is reported, the parser recovers after each one *)
+
+class Main inherits IO {
+    a : Int <- 1 +;
+    b : Int <- 2;
+
+    main() : Object {
+        {
+            out_int(a);
+            b <- ;
+            out_int(b);
+        }
+    };
+
+    test(x : Int) : Int {
+        if x < 0 then 0 else fi
+    };
+
+    other() : Object {
+        case b of
+            x : Int <- x;
+        esac
+    };
+};
@@ -1,6 +1,6 @@
 import pytest
 import os
-from utils import compare_errors
+from utils import compare_errors, all_errors
 
 tests_dir = __file__.rpartition('/')[0] + '/parser/'
 tests = [(file) for file in os.listdir(tests_dir) if file.endswith('.cl')]
@@ -10,4 +10,10 @@ tests = [(file) for file in os.listdir(tests_dir) if file.endswith('.cl')]
 @pytest.mark.run(order=2)
 @pytest.mark.parametrize("cool_file", tests)
 def test_parser_errors(compiler_path, cool_file):
-    compare_errors(compiler_path, tests_dir + cool_file, tests_dir + cool_file[:-3] + '_error.txt')
\ No newline at end of file
+    compare_errors(compiler_path, tests_dir + cool_file, tests_dir + cool_file[:-3] + '_error.txt')
+
+@pytest.mark.parser
+@pytest.mark.error
+@pytest.mark.run(order=2)
+def test_parser_recovery(compiler_path):
+    compare_errors(compiler_path, tests_dir + 'recovery1.cl', tests_dir + 'recovery1_error.txt', cmp=all_errors)
@@ -0,0 +1,71 @@
+import pytest
+import os
+import shutil
+import importlib.util
+
+from cool import FormatVisitor, tokenizer
+from cool.cmp import Token
+from cool.cmp.parsergen import rule_source, write_parser_module
+from cool.parser import PARSETAB, PARSETAB_SOURCES, cool_parser, parse
+
+tests_root = __file__.rpartition('/')[0]
+tests = [folder + '/' + file for folder in ('parser', 'codegen') for file in sorted(os.listdir(tests_root + '/' + folder)) if file.endswith('.cl')]
+
+def generate(root):
+    # the module lives next to copies of its sources, so they can be changed
+    for source in PARSETAB_SOURCES:
+        os.makedirs(os.path.dirname(root / source), exist_ok=True)
+        shutil.copyfile(os.path.join(os.path.dirname(PARSETAB), source), root / source)
+    path = root / 'parsetab.py'
+    write_parser_module(cool_parser(), str(path), PARSETAB_SOURCES)
+
+    spec = importlib.util.spec_from_file_location('generated_parsetab', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture(scope='module')
+def parsetab(tmp_path_factory):
+    return generate(tmp_path_factory.mktemp('parsetab'))
+
+def tokens_of(path):
+    with open(tests_root + '/' + path, 'r') as fd:
+        _, tokens = tokenizer(fd.read())
+    return tokens + [Token('$', '$')]
+
+def result(parse, tokens):
+    errors = []
+    ast, token = parse(tokens, errors)
+    return (FormatVisitor().visit(ast) if ast is not None else None,
+            token and (token.lex, token.line, token.column),
+            [(error.lex, error.line, error.column) for error in errors])
+
+@pytest.mark.parser
+@pytest.mark.parametrize("cool_file", tests)
+def test_generated_parse(parsetab, cool_file):
+    tokens = tokens_of(cool_file)
+    assert result(parsetab.parse, tokens) == result(parse, tokens)
+
+@pytest.mark.parser
+def test_generated_up_to_date(tmp_path):
+    parsetab = generate(tmp_path)
+    assert parsetab.up_to_date()
+
+    grammar = tmp_path / 'cmp' / 'grammar.py'
+    with open(grammar, 'a') as fd:
+        fd.write('\n# changed\n')
+    assert not parsetab.up_to_date()
+
+    os.remove(grammar)
+    assert not parsetab.up_to_date()
+
+@pytest.mark.parser
+def test_rule_source():
+    def multiplier(k):
+        return lambda h, s: s[1] * k
+    first, second = (lambda h, s: s[1]), (lambda h, s: s[2])
+
+    assert rule_source(multiplier(2)) == ('lambda h, s: s[1] * k', { 'k' })
+    # the source of a rule is found by its line, which must hold a single lambda
+    with pytest.raises(ValueError):
+        rule_source(first)
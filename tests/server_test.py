@@ -0,0 +1,50 @@
+import pytest
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from utils import compare_errors
+
+tests_root = __file__.rpartition('/')[0]
+tests = [(folder, file) for folder in ('lexer', 'parser')
+         for file in sorted(os.listdir(tests_root + '/' + folder)) if file.endswith('.cl')]
+tests += [('codegen', 'arith.cl'), ('codegen', 'hello_world.cl')]
+
+@pytest.fixture(scope='module')
+def compile_server(tmp_path_factory):
+    socket_path = str(tmp_path_factory.mktemp('server') / 'coolc.sock')
+    server = subprocess.Popen([sys.executable, '-m', 'cool.server', '--socket', socket_path, '--jobs', '2'])
+    for _ in range(100):
+        if os.path.exists(socket_path):
+            break
+        time.sleep(0.1)
+    yield socket_path
+    server.terminate()
+    server.wait(10)
+
+@pytest.mark.server
+@pytest.mark.parametrize("folder, cool_file", tests)
+def test_server(compiler_path, compile_server, monkeypatch, folder, cool_file):
+    monkeypatch.setenv('COOLC_SOCKET', compile_server)
+    error_file = tests_root + '/' + folder + '/' + cool_file[:-3] + '_error.txt'
+    compare_errors(compiler_path, tests_root + '/' + folder + '/' + cool_file, error_file if folder != 'codegen' else None)
+
+@pytest.mark.server
+def test_server_requests(compile_server):
+    with socket.socket(socket.AF_UNIX) as client:
+        client.connect(compile_server)
+        responses = client.makefile('rb')
+        for path in ('lexer/iis1.cl', 'codegen/arith.cl', 'missing.cl'):
+            client.sendall(json.dumps({'path': path, 'cwd': tests_root}).encode() + b'\n')
+            response = json.loads(responses.readline())
+            assert response['status'] == (0 if path.startswith('codegen') else 1)
+            assert response['stderr'] == ''
+            assert response['stdout'].count('\n') == (0 if path.startswith('codegen') else 1)
+
+@pytest.mark.server
+def test_server_already_listening(compile_server):
+    assert os.path.exists(compile_server)
+    server = subprocess.run([sys.executable, '-m', 'cool.server', '--socket', compile_server], capture_output=True)
+    assert server.returncode != 0 and b'already listens' in server.stderr
@@ -0,0 +1,74 @@
+import pytest
+import os
+
+from cool.cmp import Grammar, LALR1Parser
+
+class CountingParser(LALR1Parser):
+    # counts the tables built instead of loaded from the cache
+    builds = 0
+
+    def _build_parsing_table(self):
+        CountingParser.builds += 1
+        super()._build_parsing_table()
+
+def arithmetic(power=False):
+    G = Grammar()
+    E = G.NonTerminal('E', True)
+    T, F = G.NonTerminals('T F')
+    plus, star, hat, num = G.Terminals('+ * ^ num')
+    E %= E + plus + T, lambda h, s: s[1] + s[3]
+    E %= T, lambda h, s: s[1]
+    T %= T + star + F, lambda h, s: s[1] * s[3]
+    T %= F, lambda h, s: s[1]
+    F %= num, lambda h, s: s[1]
+    if power:
+        F %= num + hat + F, lambda h, s: s[1] ** s[3]
+    return G
+
+def tables(parser):
+    return ({ state: { symbol.Name: [ (action, str(tag)) for action, tag in cell ] for symbol, cell in row.items() } for state, row in parser.action.items() },
+            { state: { symbol.Name: cell for symbol, cell in row.items() } for state, row in parser.goto.items() })
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    CountingParser.builds = 0
+    return str(tmp_path)
+
+@pytest.mark.parser
+def test_cache_hit(cache_dir):
+    built = CountingParser(arithmetic(), cache_dir=cache_dir)
+    assert CountingParser.builds == 1 and len(os.listdir(cache_dir)) == 1
+
+    loaded = CountingParser(arithmetic(), cache_dir=cache_dir)
+    assert CountingParser.builds == 1
+    assert tables(loaded) == tables(built)
+    assert loaded.is_lalr1
+
+@pytest.mark.parser
+def test_cache_grammar_change(cache_dir):
+    CountingParser(arithmetic(), cache_dir=cache_dir)
+    changed = CountingParser(arithmetic(power=True), cache_dir=cache_dir)
+    assert CountingParser.builds == 2 and len(os.listdir(cache_dir)) == 2
+    assert tables(changed) == tables(LALR1Parser(arithmetic(power=True)))
+
+    # a change of a semantic rule only is a change of the grammar too
+    G = arithmetic()
+    G.Productions[-1].attributes = (lambda h, s: -s[1],)
+    CountingParser(G, cache_dir=cache_dir)
+    assert CountingParser.builds == 3
+
+@pytest.mark.parser
+@pytest.mark.parametrize("garbage", ['', '{"version": 1', '[]', '{"version": 1, "signature": "0", "action": {}, "goto": {}}'])
+def test_cache_corrupt_file(cache_dir, garbage):
+    built = CountingParser(arithmetic(), cache_dir=cache_dir)
+    path, = [ os.path.join(cache_dir, name) for name in os.listdir(cache_dir) ]
+    with open(path, 'w') as fd:
+        fd.write(garbage)
+
+    rebuilt = CountingParser(arithmetic(), cache_dir=cache_dir)
+    assert CountingParser.builds == 2
+    assert tables(rebuilt) == tables(built)
+
+    # and the table is saved again
+    CountingParser(arithmetic(), cache_dir=cache_dir)
+    assert CountingParser.builds == 2
@@ -0,0 +1,48 @@
+import pytest
+
+from cool import CoolLexer
+
+def tokens_of(tokens):
+    return [(token.lex, token.token_type, token.line, token.column) for token in tokens]
+
+@pytest.mark.lexer
+def test_reentrant_streams():
+    first_code = 'class A {\n};\n\n"one"\n#'
+    second_code = 'x <- "two" $'
+    expected_errors, expected = CoolLexer().tokenize(first_code)
+
+    lexer = CoolLexer()
+    first_errors, first = lexer.tokenize(first_code, stream=True)
+    before = [next(first) for _ in range(4)]
+    # a second scan while the first one is half way
+    second_errors, second = lexer.tokenize(second_code, stream=True)
+    second = list(second)
+    rest = list(first)
+
+    assert tokens_of(before + rest) == tokens_of(expected)
+    assert [str(error) for error in first_errors] == [str(error) for error in expected_errors]
+    assert [str(error) for error in second_errors] == [str(error) for error in CoolLexer().tokenize(second_code)[0]]
+    assert tokens_of(second) == tokens_of(CoolLexer().tokenize(second_code)[1])
+
+@pytest.mark.lexer
+def test_invalid_runs_are_one_error():
+    errors, tokens = CoolLexer().tokenize('x #$%! y\n[[ z')
+    assert [(error.pos, error.name) for error in errors] == [((1, 3), 'LexicographicError'), ((2, 1), 'LexicographicError')]
+    assert [token.lex for token in tokens] == ['x', 'y', 'z']
+
+@pytest.mark.lexer
+@pytest.mark.parametrize("max_errors", [1, 2, 3])
+def test_max_errors(max_errors):
+    code = 'a # b $ c ! d ? e "\0" f'
+    errors, tokens = CoolLexer(max_errors).tokenize(code)
+    assert len(errors) == max_errors
+    assert [error.pos for error in errors] == [error.pos for error in CoolLexer().tokenize(code)[0]][:max_errors]
+    # the tokens stop at the last error
+    assert tokens[-1].lex == 'abcde'[max_errors - 1]
+
+@pytest.mark.lexer
+def test_no_max_errors():
+    errors, _ = CoolLexer().tokenize('a # b $ c ! d ? e "\0" f')
+    # the character after a null is dropped, so the string never ends
+    assert [error.body for error in errors][-2:] == ['Null character in string', 'EOF in string']
+    assert len(errors) == 6
@@ -8,6 +8,7 @@ TEST_MUST_COMPILE = 'El test %s debe compilar'
 BAD_ERROR_FORMAT = '''El error no esta en formato: (<línea>,<columna>) - <tipo_de_error>: <texto_del_error>
                         o no se encuentra en la 3ra linea'''
 UNEXPECTED_ERROR = 'Se esperaba un %s en (%d, %d). Su error fue un %s en (%d, %d)'
+UNEXPECTED_ERROR_COUNT = 'Se esperaban %d errores. Su compilador reporto %d'
 
 ERROR_FORMAT = r'^\s*\(\s*(\d+)\s*,\s*(\d+)\s*\)\s*-\s*(\w+)\s*:(.*)$'
 
@@ -27,6 +28,15 @@ def first_error(compiler_output: list, errors: list):
         UNEXPECTED_ERROR % (error_type, line, column, oerror_type, oline, ocolumn)
 
 
+def all_errors(compiler_output: list, errors: list):
+    errors = [error for error in errors if error.strip()]
+    compiler_output = [output for output in compiler_output if output.strip()]
+    assert len(compiler_output) == len(errors), UNEXPECTED_ERROR_COUNT % (len(errors), len(compiler_output))
+
+    for error, output in zip(errors, compiler_output):
+        first_error([output], [error])
+
+
 def get_file_name(path: str):
     try:
         return path[path.rindex('/') + 1:]